@@ -0,0 +1,97 @@
+"""Benchmark the dial-out engine against a local fake Twilio.
+
+Run from the backend directory:
+
+    python -m benchmarks.dialer_benchmark --leads 2000 --cps 50 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from twilio.base.exceptions import TwilioRestException
+
+from server_utils import DialoutRequest, TwilioCallResult
+from service.dialer import DialJob, DialOutEngine
+
+
+class FakeTwilio:
+    """Stand-in for ``make_twilio_call`` with API latency and a CPS limit.
+
+    Requests that arrive faster than ``cps`` within a one second window are
+    rejected with a 429 / 20429, just like the real API.
+    """
+
+    def __init__(self, latency: float, cps: float):
+        self.latency = latency
+        self.cps = cps
+        self.window_start = time.monotonic()
+        self.window_count = 0
+        self.calls = 0
+
+    async def dial(self, request: DialoutRequest) -> TwilioCallResult:
+        now = time.monotonic()
+        if now - self.window_start >= 1:
+            self.window_start = now
+            self.window_count = 0
+        self.window_count += 1
+        if self.window_count > self.cps:
+            raise TwilioRestException(
+                429, "/Calls.json", "Too Many Requests", code=20429, method="POST"
+            )
+
+        await asyncio.sleep(self.latency * random.uniform(0.8, 1.2))
+        self.calls += 1
+        return TwilioCallResult(call_sid=f"CA{self.calls:032d}", to_number=request.to_number)
+
+
+def make_jobs(count: int) -> list[DialJob]:
+    return [
+        DialJob(
+            request=DialoutRequest(
+                to_number=f"+9190000{i:05d}", from_number="+15550000000"
+            )
+        )
+        for i in range(count)
+    ]
+
+
+async def sequential(fake: FakeTwilio, jobs: list[DialJob]) -> float:
+    started = time.monotonic()
+    for job in jobs:
+        await fake.dial(job.request)
+    return time.monotonic() - started
+
+
+async def main(args):
+    jobs = make_jobs(args.leads)
+
+    if args.leads <= 200:
+        elapsed = await sequential(FakeTwilio(args.latency, args.cps), jobs)
+        print(
+            f"sequential: {len(jobs)} dials in {elapsed:.2f}s "
+            f"({len(jobs) / elapsed:.1f} dials/sec)"
+        )
+    else:
+        per_call = args.latency
+        print(f"sequential: ~{per_call * len(jobs):.0f}s estimated (skipped)")
+
+    fake = FakeTwilio(args.latency, args.cps)
+    engine = DialOutEngine(
+        dial=fake.dial,
+        max_concurrency=args.concurrency,
+        calls_per_second=args.cps,
+        base_backoff=0.05,
+    )
+    stats = await engine.run(jobs)
+    print(f"engine:     {stats.summary()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leads", type=int, default=500)
+    parser.add_argument("--cps", type=float, default=50)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.3)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,66 @@
+"""Compare the legacy pandas parser with the streaming lead ingestion.
+
+Run from the backend directory:
+
+    python -m benchmarks.excel_benchmark --rows 100000
+"""
+
+import argparse
+import io
+import time
+import tracemalloc
+
+from openpyxl import Workbook
+
+from excel_utils import iter_lead_chunks, parse_excel_file, parse_lead_sheet
+
+
+def build_workbook(rows: int) -> bytes:
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(["name", "phoneno", "email"])
+    for i in range(rows):
+        phone = 9000000000 + i if i % 50 else None
+        email = f"lead{i}@example.com" if i % 7 else None
+        sheet.append([f"Lead {i}", phone, email])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def measure(label: str, fn) -> None:
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {elapsed:8.2f}s  peak {peak / 1024 / 1024:8.1f} MiB  {result}")
+
+
+def collect(content: bytes) -> str:
+    parsed = parse_lead_sheet(content)
+    return f"rows={len(parsed.rows)} rejects={len(parsed.rejects)}"
+
+
+def stream_only(content: bytes) -> str:
+    rows = rejects = 0
+    for chunk_rows, chunk_rejects in iter_lead_chunks(content):
+        rows += len(chunk_rows)
+        rejects += len(chunk_rejects)
+    return f"rows={rows} rejects={rejects}"
+
+
+def main(args):
+    content = build_workbook(args.rows)
+    print(f"workbook: {args.rows} rows, {len(content) / 1024:.0f} KiB")
+
+    measure("parse_excel_file", lambda: f"rows={len(parse_excel_file(content))}")
+    measure("parse_lead_sheet", lambda: collect(content))
+    measure("iter_lead_chunks", lambda: stream_only(content))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    main(parser.parse_args())
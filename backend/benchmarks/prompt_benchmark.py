@@ -0,0 +1,154 @@
+"""Compare time-to-first-token with and without a byte-stable prompt prefix.
+
+Starts a local stand-in for an OpenAI-compatible chat completions endpoint
+that, like hosted providers, caches prompt prefixes in fixed-size token blocks
+and only pays prefill time for the uncached tail. Each simulated call sends
+its opening request for a different student, either with the name spliced
+into the prompt (the old ``get_prompt`` layout) or with ``get_messages``
+(static prompt first, call details last), and measures the time until the
+first streamed chunk arrives.
+
+Run from the backend directory:
+
+    python -m benchmarks.prompt_benchmark --calls 50
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import statistics
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from loguru import logger
+
+from prompt_data import COUNSELLOR_PROMPT, get_messages
+
+NAMES = ["Asha", "Rahul", "Fatima", "Kwame", "Nadia", "Tenzin", "Ibrahim", "Priya"]
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def tokenize(messages: list[dict]) -> list[str]:
+    tokens = []
+    for message in messages:
+        tokens.append(f"<|{message['role']}|>")
+        tokens.extend(TOKEN_PATTERN.findall(message["content"]))
+    return tokens
+
+
+class StandInLLM:
+    """Prefix-caching model stand-in.
+
+    Args:
+        block_size (int): Tokens per cached block; a block is reused only if
+            it and every block before it match.
+        prefill_ms_per_token (float): Prefill cost of an uncached token.
+        base_ms (float): Fixed latency per request.
+    """
+
+    def __init__(self, block_size: int, prefill_ms_per_token: float, base_ms: float):
+        self.block_size = block_size
+        self.prefill_ms_per_token = prefill_ms_per_token
+        self.base_ms = base_ms
+        self._blocks: set[str] = set()
+        self._lock = threading.Lock()
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+
+    def prefill(self, messages: list[dict]) -> float:
+        """Seconds to wait before the first token; caches the prompt's blocks."""
+        tokens = tokenize(messages)
+        digest = hashlib.sha256()
+        cached = 0
+        hit = True
+        with self._lock:
+            for start in range(0, len(tokens) - self.block_size + 1, self.block_size):
+                digest.update("\x00".join(tokens[start : start + self.block_size]).encode())
+                key = digest.hexdigest()
+                if hit and key in self._blocks:
+                    cached += self.block_size
+                else:
+                    hit = False
+                    self._blocks.add(key)
+            self.prompt_tokens += len(tokens)
+            self.cached_tokens += cached
+        uncached = len(tokens) - cached
+        return (self.base_ms + uncached * self.prefill_ms_per_token) / 1000
+
+
+def serve(model: StandInLLM) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(model.prefill(body["messages"]))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            chunk = {"choices": [{"delta": {"content": "Hello"}, "index": 0}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def legacy_messages(name: str) -> list[dict]:
+    # The old layout: one system message with the name spliced into the text
+    return [{"role": "system", "content": COUNSELLOR_PROMPT.replace("[student name]", name)}]
+
+
+def ttft_ms(url: str, messages: list[dict]) -> float:
+    payload = json.dumps({"model": "stand-in", "stream": True, "messages": messages}).encode()
+    request = urllib.request.Request(url, payload, {"Content-Type": "application/json"})
+    started = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.readline()
+        elapsed = (time.perf_counter() - started) * 1000
+        response.read()
+    return elapsed
+
+
+def run(layout: str, args) -> dict:
+    model = StandInLLM(args.block_size, args.prefill_ms_per_token, args.base_ms)
+    server = serve(model)
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+    build = legacy_messages if layout == "name_in_prompt" else get_messages
+    timings = []
+    for i in range(args.calls):
+        messages = build(f"{NAMES[i % len(NAMES)]} {i}")
+        messages.append({"role": "user", "content": "Hello?"})
+        timings.append(ttft_ms(url, messages))
+    server.shutdown()
+    timings.sort()
+    return {
+        "layout": layout,
+        "prompt_tokens": len(tokenize(messages)),
+        "cached_ratio": round(model.cached_tokens / model.prompt_tokens, 3),
+        "ttft_ms_max": round(timings[-1], 1),
+        "ttft_ms_p50": round(statistics.median(timings), 1),
+        "ttft_ms_p99": round(timings[int(len(timings) * 0.99)], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--block-size", type=int, default=128)
+    parser.add_argument("--prefill-ms-per-token", type=float, default=0.05)
+    parser.add_argument("--base-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    for layout in ("name_in_prompt", "stable_prefix"):
+        logger.info(run(layout, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Compare FastAPI's default JSON encoding with ORJSONResponse for call lists.
+
+For each document count, times the encode step and reports the bytes on the
+wire raw, gzipped and (if installed) brotli-compressed.
+
+Run from the backend directory:
+
+    python -m benchmarks.response_benchmark --sizes 1000 10000 100000
+"""
+
+import argparse
+import gzip
+import random
+import time
+from datetime import datetime, timedelta
+
+from beanie import PydanticObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from core.responses import ORJSONResponse, brotli
+from schemas.user import CallDetail
+
+WORDS = "admission course fees hostel scholarship counsellor campus semester placement".split()
+
+
+def make_calls(count: int, transcript_words: int) -> list[CallDetail]:
+    start = datetime.utcnow()
+    calls = []
+    for i in range(count):
+        created = start - timedelta(minutes=i)
+        calls.append(
+            CallDetail(
+                _id=PydanticObjectId(),
+                name=f"Student {i}",
+                email=f"student{i}@example.com",
+                phonenumber=f"+91{9000000000 + i}",
+                call_sid=f"CA{i:032x}",
+                status=random.choice(["completed", "no-answer", "busy", "scheduled"]),
+                Duration=random.randint(0, 600),
+                Quality_Score=random.randint(0, 100),
+                Outcome=random.choice(["Interested", "Not Interested", "Callback"]),
+                Transcript=" ".join(random.choices(WORDS, k=transcript_words)),
+                Analysis=" ".join(random.choices(WORDS, k=transcript_words // 10)),
+                createdAt=created,
+                updatedAt=created,
+            )
+        )
+    return calls
+
+
+def timed(fn) -> tuple[float, bytes]:
+    started = time.perf_counter()
+    body = fn()
+    return time.perf_counter() - started, body
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--transcript-words", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'docs':>7} {'encoder':>8} {'encode ms':>10} {'raw KB':>9} {'gzip KB':>9} {'br KB':>9}")
+    for size in args.sizes:
+        content = {"items": make_calls(size, args.transcript_words), "next_cursor": None}
+
+        default_time, default_body = timed(
+            lambda: JSONResponse(jsonable_encoder(content)).body
+        )
+        orjson_time, orjson_body = timed(lambda: ORJSONResponse(content).body)
+
+        gzipped = len(gzip.compress(orjson_body, compresslevel=6))
+        brotlied = len(brotli.compress(orjson_body, quality=4)) if brotli else None
+
+        for name, elapsed, body in (
+            ("default", default_time, default_body),
+            ("orjson", orjson_time, orjson_body),
+        ):
+            print(
+                f"{size:>7} {name:>8} {elapsed * 1000:>10.1f} {len(body) / 1024:>9.0f} "
+                f"{gzipped / 1024:>9.0f} "
+                f"{(f'{brotlied / 1024:.0f}' if brotlied else 'n/a'):>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
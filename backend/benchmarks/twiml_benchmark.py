@@ -0,0 +1,45 @@
+"""Time the precompiled TwiML template against ``generate_twiml``.
+
+Byte-for-byte equivalence is covered by ``test_twiml.py``.
+
+Run from the backend directory:
+
+    python -m benchmarks.twiml_benchmark --iterations 20000
+"""
+
+import argparse
+import os
+import timeit
+
+from loguru import logger
+
+import server_utils
+from server_utils import TwimlRequest, generate_twiml
+
+SAMPLE = TwimlRequest(to_number="+919876543210", from_number="+14155550100")
+ENVIRONMENT = {"ENV": "local", "LOCAL_SERVER_URL": "https://example.ngrok.io"}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    # generate_twiml logs at debug level on every call
+    logger.remove()
+
+    os.environ.update(ENVIRONMENT)
+    server_utils._twiml_template = None
+    template = server_utils.get_twiml_template()
+    sample = SAMPLE
+
+    baseline = timeit.timeit(lambda: generate_twiml(sample), number=args.iterations)
+    compiled = timeit.timeit(lambda: template.render(sample), number=args.iterations)
+
+    print(f"generate_twiml : {baseline / args.iterations * 1e6:8.2f} us/call")
+    print(f"TwimlTemplate  : {compiled / args.iterations * 1e6:8.2f} us/call")
+    print(f"Speedup        : {baseline / compiled:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
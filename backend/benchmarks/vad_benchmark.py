@@ -0,0 +1,185 @@
+"""Compare the Silero VAD modes: a model per call, one shared model, and
+batched inference across calls.
+
+Each mode runs in a fresh subprocess so RSS and CPU numbers are not polluted
+by the others.
+
+- Setup: per-call setup time and resident memory per call, plus a check
+  that every mode returns the same confidences for the same audio.
+- Load: simulated concurrent calls, each on its own thread (as pipecat runs
+  each analyzer) sending a 32 ms frame in real time. Reports VAD CPU per
+  call and p50/p99 decision latency.
+
+Run from the backend directory:
+
+    python -m benchmarks.vad_benchmark --calls 50 --load-calls 50 --seconds 5
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+from service.call_metrics import current_rss_bytes
+
+MODES = ("per_call", "shared", "batched")
+FRAME_SECONDS = 256 / 8000
+
+
+def _audio(frames: int, seed: int = 0) -> list[bytes]:
+    rng = np.random.default_rng(seed)
+    t = np.arange(256 * frames) / 8000
+    signal = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(t.size)
+    pcm = (signal * 32767).astype(np.int16).tobytes()
+    return [pcm[i : i + 512] for i in range(0, len(pcm), 512)]
+
+
+def _factory(mode: str):
+    from pipecat.audio.vad.silero import SileroVADAnalyzer
+
+    from service.vad import BatchedSileroVADAnalyzer, SharedSileroVADAnalyzer, load_vad_model
+
+    if mode != "per_call":
+        load_vad_model()  # done at startup, not per call
+    cls = {
+        "per_call": SileroVADAnalyzer,
+        "shared": SharedSileroVADAnalyzer,
+        "batched": BatchedSileroVADAnalyzer,
+    }[mode]
+
+    def build():
+        analyzer = cls()
+        analyzer.set_sample_rate(8000)
+        return analyzer
+
+    return build
+
+
+def run_setup(mode: str, calls: int) -> dict:
+    build = _factory(mode)
+    rss_before = current_rss_bytes()
+    analyzers, setup = [], []
+    for _ in range(calls):
+        started = time.perf_counter()
+        analyzer = build()
+        setup.append((time.perf_counter() - started) * 1000)
+        # Run one frame so lazily allocated per-call state is counted
+        analyzer.voice_confidence(_audio(1)[0])
+        analyzers.append(analyzer)
+    rss_after = current_rss_bytes()
+
+    confidences = [float(np.squeeze(analyzers[0].voice_confidence(f))) for f in _audio(40)]
+    return {
+        "setup_ms_avg": sum(setup) / len(setup),
+        "setup_ms_max": max(setup),
+        "rss_per_call_kb": (rss_after - rss_before) / calls / 1024,
+        "confidences": confidences,
+    }
+
+
+def run_load(mode: str, calls: int, seconds: float) -> dict:
+    build = _factory(mode)
+    analyzers = [build() for _ in range(calls)]
+    frames = int(seconds / FRAME_SECONDS)
+    latencies: list[list[float]] = [[] for _ in range(calls)]
+    start = threading.Barrier(calls + 1)
+
+    def call(index: int) -> None:
+        audio = _audio(frames, seed=index)
+        start.wait()
+        # Stagger calls across the frame interval like real arrivals
+        next_frame = time.perf_counter() + FRAME_SECONDS * index / calls
+        for frame in audio:
+            delay = next_frame - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            started = time.perf_counter()
+            analyzers[index].voice_confidence(frame)
+            latencies[index].append((time.perf_counter() - started) * 1000)
+            next_frame += FRAME_SECONDS
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(calls)]
+    for thread in threads:
+        thread.start()
+    cpu_before = time.process_time()
+    start.wait()
+    wall_started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - wall_started
+    cpu = time.process_time() - cpu_before
+
+    flat = np.array([value for per_call in latencies for value in per_call])
+    return {
+        "cpu_ms_per_call_second": cpu * 1000 / calls / wall,
+        "latency_ms_p50": float(np.percentile(flat, 50)),
+        "latency_ms_p99": float(np.percentile(flat, 99)),
+    }
+
+
+def _subprocess(args: list[str]) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.vad_benchmark", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--load-calls", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--mode", choices=MODES)
+    parser.add_argument("--load", action="store_true")
+    args = parser.parse_args()
+
+    if args.mode:
+        from loguru import logger
+
+        logger.remove()
+        if args.load:
+            result = run_load(args.mode, args.load_calls, args.seconds)
+        else:
+            result = run_setup(args.mode, args.calls)
+        print(json.dumps(result))
+        return
+
+    setup = {mode: _subprocess(["--mode", mode, "--calls", str(args.calls)]) for mode in MODES}
+    for mode in MODES[1:]:
+        assert np.allclose(
+            setup["per_call"]["confidences"], setup[mode]["confidences"], atol=1e-5
+        ), f"{mode} VAD gives different confidences"
+
+    print(f"Setup, {args.calls} calls")
+    print(f"{'mode':>9} {'setup avg ms':>13} {'setup max ms':>13} {'RSS/call KB':>12}")
+    for mode, r in setup.items():
+        print(
+            f"{mode:>9} {r['setup_ms_avg']:>13.2f} {r['setup_ms_max']:>13.2f} "
+            f"{r['rss_per_call_kb']:>12.0f}"
+        )
+
+    print(f"\nLoad, {args.load_calls} concurrent calls for {args.seconds:.0f}s")
+    print(f"{'mode':>9} {'CPU ms/call/s':>14} {'p50 ms':>8} {'p99 ms':>8}")
+    for mode in ("shared", "batched"):
+        r = _subprocess(
+            [
+                "--mode", mode, "--load",
+                "--load-calls", str(args.load_calls),
+                "--seconds", str(args.seconds),
+            ]
+        )
+        print(
+            f"{mode:>9} {r['cpu_ms_per_call_second']:>14.2f} "
+            f"{r['latency_ms_p50']:>8.2f} {r['latency_ms_p99']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,11 @@
 
 import os
 import sys
+from typing import Optional
 
 from dotenv import load_dotenv
 from loguru import logger
 import asyncio
-from pipecat.audio.vad.silero import SileroVADAnalyzer
 from pipecat.audio.vad.vad_analyzer import VADParams
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
@@ -55,8 +55,16 @@ from pipecat.transports.websocket.fastapi import (
 from starlette.websockets import WebSocketDisconnect
 from pipecat.processors.audio.audio_buffer_processor import AudioBufferProcessor
 from service.bot import save_recording
-
-from prompt_data import get_prompt
+from service.call_context import call_context
+from service.call_metrics import call_metrics
+from service.call_session import CallSession
+from service.post_call import post_call_queue
+from service.scheduler import callback_dispatcher
+from service.vad import build_vad_analyzer
+
+from prompt_data import get_messages
+from models.call_event import CallEventSource
+from models.post_call_job import PostCallJobKind
 from models.user import User, CallStatus
 from datetime import datetime, timedelta
 
@@ -73,7 +81,12 @@ logger.add(sys.stdout, level="DEBUG")
 from pipecat.services.llm_service import FunctionCallParams
 
 
-async def run_bot(transport: BaseTransport, handle_sigint: bool, call_data: dict):
+async def run_bot(
+    transport: BaseTransport,
+    handle_sigint: bool,
+    call_data: dict,
+    session: Optional[CallSession] = None,
+):
 
     # llm = OpenRouterLLMService(
     #     api_key=os.getenv("OPEN_ROUTER_API_KEY"),
@@ -92,6 +105,7 @@ async def run_bot(transport: BaseTransport, handle_sigint: bool, call_data: dict
             "Missing DEEPGRAM_API_KEY environment variable for Deepgram STT"
         )
     call_id = call_data["call_id"]
+    session = session or CallSession(call_id)
     transcript_history: list[dict[str, str]] = []
 
     stt = DeepgramSTTService(
@@ -116,8 +130,6 @@ async def run_bot(transport: BaseTransport, handle_sigint: bool, call_data: dict
         voice_id="95d51f79-c397-46f9-b49a-23763d3eaa2d",  # British Reading Lady
     )
 
-    from service.generate_context import analyze_transcript
-
     async def schedule_callback_function(params: FunctionCallParams):
         """Schedule a callback when user requests it."""
         try:
@@ -127,36 +139,19 @@ async def run_bot(transport: BaseTransport, handle_sigint: bool, call_data: dict
 
             future_time = datetime.utcnow() + timedelta(minutes=delay)
 
-            if call_id:
-                user = await User.find_one(User.call_sid == call_id)
-                if user:
-                    user.status = CallStatus.SCHEDULED
-                    user.time_to_call = future_time
-                    await user.save()
-                    final_transcript = " ".join(transcript_history)
-                    analyst_result = await analyze_transcript(final_transcript)
-            if call_id:
-                try:
-                    user = await User.find_one(User.call_sid == call_id)
-                    if user:
-                        user.Transcript = final_transcript
-                        user.Analysis = analyst_result.summary
-                        # Cast float score to int to match model definition
-                        user.Quality_Score = int(analyst_result.quality_score)
-                        user.Intent = analyst_result.intent
-                        user.Outcome = analyst_result.outcome
-                        await user.save()
-                        logger.info(
-                            f"Saved analysis for call {call_id}: Score {user.Quality_Score}"
-                        )
-                    else:
-                        logger.warning(
-                            f"User not found for call {call_id} to save analysis"
-                        )
-                except Exception as e:
-                    logger.error(f"Error saving analysis to DB: {e}")
+            if await session.load():
+                session.set(status=CallStatus.SCHEDULED, time_to_call=future_time)
+                # Written straight away so the dispatcher sees the callback
+                if await session.checkpoint("callback_scheduled"):
+                    callback_dispatcher.notify()
+                    await session.record_event(
+                        CallEventSource.BOT,
+                        "callback_scheduled",
+                        time_to_call=future_time,
+                        minutes_delay=delay,
+                    )
                     logger.info(
-                        f"Scheduled callback for {user.name} at {future_time} (delay: {delay} min)"
+                        f"Scheduled callback for {session.name} at {future_time} (delay: {delay} min)"
                     )
 
             # Simple heuristic for friendlier message
@@ -213,23 +208,29 @@ async def run_bot(transport: BaseTransport, handle_sigint: bool, call_data: dict
         standard_tools=[restaurant_function, schedule_callback_schema, end_call_schema]
     )
 
-    # Fetch user name from DB
-    call_id = call_data.get("call_id")
-    user_name = "abc"  # Default name
-    if call_id:
+    # The name comes from the stream parameters or the context prefetched
+    # during /twiml, so the pipeline normally starts without a DB read; the
+    # session finishes loading the user in the background.
+    user_name = call_data.get("body", {}).get("student_name")
+    if not user_name:
+        prefetched = call_context.peek(call_id)
+        user_name = prefetched.name if prefetched else None
+    session.preload()
+    if user_name:
+        logger.info(f"Using prefetched context for call {call_id}: {user_name}")
+    else:
+        user_name = "abc"  # Default name
         try:
-            user = await User.find_one(User.call_sid == call_id)
-            if user and user.name:
-                user_name = user.name
+            if await session.load():
+                user_name = session.name
                 logger.info(f"Found user {user_name} for call {call_id}")
             else:
                 logger.warning(f"No user found for call {call_id}, using default")
         except Exception as e:
             logger.error(f"Error fetching user for call {call_id}: {e}")
 
-    messages = [
-        {"role": "system", "content": get_prompt(user_name)},
-    ]
+    # Static prompt first so its prefix stays cached across calls
+    messages = get_messages(user_name)
 
     context = LLMContext(messages, tools)
     context_aggregator = LLMContextAggregatorPair(context)
@@ -280,6 +281,7 @@ async def run_bot(transport: BaseTransport, handle_sigint: bool, call_data: dict
         return summary
 
     async def end_call_function(params: FunctionCallParams):
+        await session.record_event(CallEventSource.BOT, "end_call_requested")
         await params.llm.push_frame(TTSSpeakFrame("Goodbye! Ending the call now."))
         await call_end_function()
         await params.result_callback({"status": "call_ended"})
@@ -294,12 +296,13 @@ async def run_bot(transport: BaseTransport, handle_sigint: bool, call_data: dict
     @audio_buffer.event_handler("on_audio_data")
     async def on_audio_data(buffer, audio: bytes, sample_rate: int, num_channels: int):
         # Buffer audio data for later upload
-        await save_recording(buffer, audio, sample_rate, num_channels, call_id)
+        await save_recording(buffer, audio, sample_rate, num_channels, session)
 
     @transport.event_handler("on_client_connected")
     async def on_client_connected(transport, client):
         # Kick off the outbound conversation, waiting for the user to speak first
         await audio_buffer.start_recording()
+        await session.record_event(CallEventSource.BOT, "connected")
         await asyncio.sleep(1.0)
         await task.queue_frames([LLMRunFrame()])
         logger.info("Starting outbound call conversation")
@@ -307,41 +310,27 @@ async def run_bot(transport: BaseTransport, handle_sigint: bool, call_data: dict
     @transport.event_handler("on_client_disconnected")
     async def on_client_disconnected(transport, client):
         logger.info("Outbound call ended")
-        # this is for summarizing the text what is the conversation is happening between user and bot
-        final_transcript = " ".join(transcript_history)
-        from service.generate_context import analyze_transcript
-
-        analyst_result = await analyze_transcript(final_transcript)
-
-        if call_id:
-            try:
-                user = await User.find_one(User.call_sid == call_id)
-                if user:
-                    user.Transcript = final_transcript
-                    user.Analysis = analyst_result.summary
-                    # Cast float score to int to match model definition
-                    user.Quality_Score = int(analyst_result.quality_score)
-                    user.Intent = analyst_result.intent
-                    user.Outcome = analyst_result.outcome
-                    await user.save()
-                    logger.info(
-                        f"Saved analysis for call {call_id}: Score {user.Quality_Score}"
-                    )
-                else:
-                    logger.warning(
-                        f"User not found for call {call_id} to save analysis"
-                    )
-            except Exception as e:
-                logger.error(f"Error saving analysis to DB: {e}")
-
+        await session.record_event(
+            CallEventSource.BOT, "disconnected", transcript_turns=len(transcript_history)
+        )
+        # The transcript is analysed by the post-call queue once the pipeline stops
         await task.cancel()
 
     runner = PipelineRunner(handle_sigint=handle_sigint)
 
+    setup_ms = call_metrics.setup_finished(call_id)
+    if setup_ms is not None:
+        logger.info(f"Call {call_id} set up in {setup_ms:.0f}ms")
+
     try:
         await runner.run(task)
     except WebSocketDisconnect:
         logger.info("Websocket disconnected; stopping pipeline cleanly")
+    finally:
+        # Summarising the conversation runs on the post-call queue, off the call path
+        await post_call_queue.enqueue(
+            PostCallJobKind.ANALYSIS, call_id, transcript=" ".join(transcript_history)
+        )
 
 
 async def bot(runner_args: RunnerArguments):
@@ -355,6 +344,8 @@ async def bot(runner_args: RunnerArguments):
 
     logger.info(f"Call metadata - To: {to_number}, From: {from_number}")
 
+    call_metrics.setup_started(call_data["call_id"])
+
     serializer = TwilioFrameSerializer(
         stream_sid=call_data["stream_id"],
         call_sid=call_data["call_id"],
@@ -368,12 +359,19 @@ async def bot(runner_args: RunnerArguments):
             audio_in_enabled=True,
             audio_out_enabled=True,
             add_wav_header=False,
-            # vad_analyzer=_build_vad_analyzer(),
-            vad_analyzer=SileroVADAnalyzer(),
+            # One ONNX session per process, batched across calls (VAD_MODE)
+            vad_analyzer=build_vad_analyzer(),
             serializer=serializer,
         ),
     )
 
     handle_sigint = runner_args.handle_sigint
 
-    await run_bot(transport, handle_sigint, call_data)
+    session = CallSession(call_data["call_id"])
+    try:
+        await run_bot(transport, handle_sigint, call_data, session)
+    finally:
+        # Anything staged after the last checkpoint
+        await session.checkpoint("call_end")
+        call_metrics.call_ended(call_data["call_id"], db_round_trips=session.db_round_trips)
+        logger.info(f"Call {call_data['call_id']} made {session.db_round_trips} DB round trips")
@@ -1,12 +1,54 @@
 from dotenv import load_dotenv
 
 load_dotenv()
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient
 from beanie import init_beanie
 from models.user import User
+from models.call_event import CallEvent
+from models.campaign import Campaign, CampaignRow
+from models.post_call_job import PostCallJob
 import os
 
-client: AsyncIOMotorClient | None = None
+client: AsyncMongoClient | None = None
+
+
+async def _migrate_call_sids(database) -> None:
+    """Make ``user.call_sid`` unique before its unique index is built.
+
+    Rows written before a CallSid was stored get ``legacy-<_id>``; when a
+    CallSid appears more than once, the newest document keeps it and the
+    others get ``<call_sid>-dup-<_id>``. Nothing is deleted. Skipped once the
+    unique index exists, so only the first start after upgrading scans.
+    """
+    users = database[User.Settings.name]
+    for index in (await users.index_information()).values():
+        if index.get("key") == [("call_sid", 1)] and index.get("unique"):
+            return
+
+    result = await users.update_many(
+        {"$or": [{"call_sid": None}, {"call_sid": ""}]},
+        [{"$set": {"call_sid": {"$concat": ["legacy-", {"$toString": "$_id"}]}}}],
+    )
+    if result.modified_count:
+        print(f" Gave {result.modified_count} call records without a CallSid a legacy id")
+
+    renamed = 0
+    duplicates = await users.aggregate(
+        [
+            {"$sort": {"createdAt": -1, "_id": -1}},
+            {"$group": {"_id": "$call_sid", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}},
+        ],
+        allowDiskUse=True,
+    )
+    async for duplicate in duplicates:
+        for older in duplicate["ids"][1:]:
+            await users.update_one(
+                {"_id": older}, {"$set": {"call_sid": f"{duplicate['_id']}-dup-{older}"}}
+            )
+            renamed += 1
+    if renamed:
+        print(f" Renamed {renamed} duplicate CallSids so the unique index can be built")
 
 
 async def init_db():
@@ -19,19 +61,28 @@ async def init_db():
         raise RuntimeError("MONGO_URL or DB_NAME is not set")
 
     try:
-        client = AsyncIOMotorClient(mongo_url, serverSelectionTimeoutMS=5000)
+        client = AsyncMongoClient(mongo_url, serverSelectionTimeoutMS=5000)
         await client.admin.command("ping")
-
-        database = client[db_name]
-
-        await init_beanie(database=database, document_models=[User])
-
-        print(" MongoDB connected successfully")
     except Exception as e:
         print(f" MongoDB connection failed: {e}")
         client = None
+        return
+
+    # Past this point the database is reachable; a failed migration or index
+    # build must stop startup rather than run with persistence switched off
+    database = client[db_name]
+    try:
+        await _migrate_call_sids(database)
+        await init_beanie(database=database, document_models=[User, Campaign, CampaignRow, CallEvent, PostCallJob])
+    except Exception as e:
+        print(f" MongoDB schema setup failed: {e}")
+        await client.close()
+        client = None
+        raise
+
+    print(" MongoDB connected successfully")
 
 
 async def close_db():
     if client:
-        client.close()
+        await client.close()
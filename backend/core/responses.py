@@ -0,0 +1,112 @@
+import os
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is used without it
+    brotli = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+
+def _orjson_default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        # Same shape FastAPI's encoder gives: aliases, so Beanie's id is "_id"
+        return value.model_dump(by_alias=True)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Handles ``PydanticObjectId``/``ObjectId`` (as strings), datetimes (ISO 8601,
+    as FastAPI renders them), enums and pydantic models, including Beanie
+    documents. Returning it directly from an endpoint also skips FastAPI's
+    ``jsonable_encoder`` pass.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_orjson_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+
+class BrotliResponder(GZipResponder):
+    """Brotli-encodes the response, or gzip-encodes it without ``brotli``."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        quality: int = 4,
+        compresslevel: int = 6,
+    ) -> None:
+        super().__init__(app, minimum_size, compresslevel=compresslevel)
+        self.compressor = None
+        if brotli is not None:
+            self.content_encoding = "br"
+            self.compressor = brotli.Compressor(quality=quality)
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if self.compressor is None:
+            return super().apply_compression(body, more_body=more_body)
+        compressed = self.compressor.process(body)
+        if more_body:
+            return compressed + self.compressor.flush()
+        return compressed + self.compressor.finish()
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """Compresses responses of at least ``minimum_size`` bytes.
+
+    Uses brotli when the client accepts it and the ``brotli`` package is
+    installed, gzip otherwise. Server-Sent Events are never compressed.
+
+    Args:
+        app (ASGIApp): The application to wrap.
+        minimum_size (int): Smallest body, in bytes, worth compressing;
+            defaults to ``COMPRESSION_MIN_SIZE`` or 1024.
+        compresslevel (int): gzip level.
+        brotli_quality (int): brotli quality.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        compresslevel: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        accept = Headers(scope=scope).get("Accept-Encoding", "") if scope["type"] == "http" else ""
+        # Without brotli installed the responder gzips, so only take it when
+        # the client accepts gzip too
+        if "br" in accept and (brotli is not None or "gzip" in accept):
+            responder = BrotliResponder(
+                self.app,
+                self.minimum_size,
+                quality=self.brotli_quality,
+                compresslevel=self.compresslevel,
+            )
+            await responder(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
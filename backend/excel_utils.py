@@ -1,6 +1,42 @@
 import io
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+from openpyxl import load_workbook
+from pydantic import BaseModel
+
+from service.phone import normalize_phone_column
+
+REQUIRED_COLUMNS = ["name", "phoneno", "email"]
+
+# Rows are streamed from the sheet and cleaned this many at a time.
+DEFAULT_CHUNK_SIZE = 5000
+
+class RejectedRow(BaseModel):
+    """A spreadsheet row that was not accepted for dialing.
+
+    Attributes:
+        row_number (int): 1-based row number in the sheet (the header is row 1).
+        reason (str): Why the row was rejected.
+        data (Dict[str, Any]): The row values as read from the sheet.
+    """
+
+    row_number: int
+    reason: str
+    data: Dict[str, Any]
+
+
+class ParsedSheet(BaseModel):
+    """Result of ingesting a lead sheet.
+
+    Attributes:
+        rows (List[Dict[str, Any]]): Clean rows with keys row_number, name, phoneno, email.
+        rejects (List[RejectedRow]): Per-row reject report.
+    """
+
+    rows: List[Dict[str, Any]] = []
+    rejects: List[RejectedRow] = []
+
 
 def parse_excel_file(file_content: bytes) -> List[Dict[str, Any]]:
     """
@@ -59,3 +95,172 @@ def parse_excel_file(file_content: bytes) -> List[Dict[str, Any]]:
         # Log the error or re-raise
         print(f"Error parsing excel file: {e}")
         return []
+
+
+def _is_csv(file_content: bytes, filename: Optional[str]) -> bool:
+    if filename:
+        return filename.lower().endswith(".csv")
+    # xlsx files are zip archives
+    return not file_content.startswith(b"PK")
+
+
+def _check_columns(columns) -> None:
+    missing = [col for col in REQUIRED_COLUMNS if col not in columns]
+    if "phoneno" in missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+
+def _iter_xlsx_frames(file_content: bytes, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Stream the first sheet of a workbook as string-typed DataFrame chunks."""
+    workbook = load_workbook(io.BytesIO(file_content), read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(col).strip().lower() if col is not None else "" for col in header]
+        _check_columns(columns)
+
+        indexes = [columns.index(col) for col in REQUIRED_COLUMNS if col in columns]
+        selected = [columns[i] for i in indexes]
+
+        chunk = []
+        for row in rows:
+            chunk.append([row[i] if i < len(row) else None for i in indexes])
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk, columns=selected, dtype=object)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=selected, dtype=object)
+    finally:
+        workbook.close()
+
+
+def _iter_csv_frames(file_content: bytes, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Stream a CSV file as string-typed DataFrame chunks.
+
+    Blank lines are kept as empty rows so row numbers match the file;
+    ``clean_lead_frame`` drops them after numbering.
+    """
+    reader = pd.read_csv(
+        io.BytesIO(file_content),
+        dtype="string",
+        chunksize=chunk_size,
+        skip_blank_lines=False,
+    )
+    with reader:
+        for frame in reader:
+            frame.columns = [str(col).strip().lower() for col in frame.columns]
+            _check_columns(frame.columns)
+            yield frame[[col for col in REQUIRED_COLUMNS if col in frame.columns]]
+
+
+def clean_lead_frame(
+    df: pd.DataFrame, first_row_number: int, seen_phones: Optional[set] = None
+) -> Tuple[List[Dict[str, Any]], List[RejectedRow]]:
+    """Normalize a chunk of lead rows with vectorized string operations.
+
+    Values are cast to strings (so phone numbers never pick up a float ``.0``),
+    trimmed, and blanks become None. Phone numbers are converted to E.164.
+    Rows without a usable phone number, or repeating a number already seen in
+    the file, go to the reject report; fully blank rows are dropped silently.
+
+    Args:
+        df (pd.DataFrame): Chunk as read from the sheet.
+        first_row_number (int): Sheet row number of the first row in the chunk.
+        seen_phones (Optional[set]): Numbers accepted from earlier chunks; updated
+            in place with the numbers accepted from this one.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], List[RejectedRow]]: Clean rows and rejects.
+    """
+    df = df.reindex(columns=REQUIRED_COLUMNS)
+    df.index = range(first_row_number, first_row_number + len(df))
+
+    for col in REQUIRED_COLUMNS:
+        values = df[col].astype("string").str.strip()
+        df[col] = values.mask(values == "")
+
+    df = df.dropna(how="all")
+
+    missing = df["phoneno"].isna()
+    phone = normalize_phone_column(df["phoneno"])
+    invalid = ~missing & phone.isna()
+    df["phoneno"] = phone.fillna(df["phoneno"])
+    df["email"] = df["email"].str.lower()
+
+    if seen_phones is None:
+        seen_phones = set()
+    duplicate = phone.notna() & (
+        phone.duplicated() | phone.isin(seen_phones).fillna(False)
+    )
+
+    rejects = []
+    for mask, reason in (
+        (missing, "No phone number"),
+        (invalid, "Invalid phone number"),
+        (duplicate, "Duplicate phone number in file"),
+    ):
+        if mask.any():
+            bad = df[mask].astype(object).where(df[mask].notna(), None)
+            rejects.extend(
+                RejectedRow(row_number=row_number, reason=reason, data=data)
+                for row_number, data in bad.to_dict(orient="index").items()
+            )
+
+    good = df[~(missing | invalid | duplicate)]
+    seen_phones.update(good["phoneno"])
+    good = good.astype(object).where(good.notna(), None)
+    good.insert(0, "row_number", good.index)
+    rows = good.to_dict(orient="records")
+    return rows, rejects
+
+
+def iter_lead_chunks(
+    file_content: bytes,
+    filename: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[List[Dict[str, Any]], List[RejectedRow]]]:
+    """Stream clean lead rows from an xlsx or CSV upload, one chunk at a time.
+
+    Workbooks are read with openpyxl in read-only mode and CSV files with
+    chunked ``read_csv``, so memory stays proportional to ``chunk_size``
+    rather than to the size of the sheet.
+
+    Args:
+        file_content (bytes): The uploaded file.
+        filename (Optional[str]): Upload filename, used to detect CSV.
+        chunk_size (int): Rows per chunk.
+
+    Yields:
+        Tuple[List[Dict[str, Any]], List[RejectedRow]]: Clean rows and rejects per chunk.
+
+    Raises:
+        ValueError: If the sheet has no ``phoneno`` column.
+    """
+    if _is_csv(file_content, filename):
+        frames = _iter_csv_frames(file_content, chunk_size)
+    else:
+        frames = _iter_xlsx_frames(file_content, chunk_size)
+
+    row_number = 2  # row 1 is the header
+    seen_phones: set = set()
+    for frame in frames:
+        yield clean_lead_frame(frame, row_number, seen_phones)
+        row_number += len(frame)
+
+
+def parse_lead_sheet(
+    file_content: bytes,
+    filename: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> ParsedSheet:
+    """Read a whole lead sheet into clean rows plus a reject report.
+
+    See ``iter_lead_chunks`` for the streaming variant.
+    """
+    parsed = ParsedSheet()
+    for rows, rejects in iter_lead_chunks(file_content, filename, chunk_size):
+        parsed.rows.extend(rows)
+        parsed.rejects.extend(rejects)
+    return parsed
@@ -6,20 +6,24 @@ from fastapi import FastAPI, Request, WebSocket, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, JSONResponse
 from loguru import logger
+from core.responses import CompressionMiddleware, ORJSONResponse
 from server_utils import (
     DialoutResponse,
     dialout_request_from_request,
-    generate_twiml,
+    close_twilio_client,
+    get_twilio_config,
+    get_twiml_template,
+    init_twilio_client,
+    init_twiml_template,
     make_twilio_call,
     parse_twiml_request,
-    DialoutRequest,
 )
-from excel_utils import parse_excel_file
+from service.campaign import recover_interrupted_campaigns, start_campaign
 
 load_dotenv()
 
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,33 +32,55 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
 
 
+from core import database
 from core.database import init_db
-from models.user import User, CallStatus
 from routers.user import router as user_router
 from routers.health import health_router
-
-# from routers.user import check_scheduled_calls
-# from fastapi_crons import Crons
-
-
-# loader = Crons(app)
-
-
-# @loader.cron("*/1 * * * *", name="check_scheduled_calls")
-# async def _register_check_scheduled_calls_job():
-#     await check_scheduled_calls()
+from routers.campaign import router as campaign_router
+from service.query_audit import audit_query_plans
+from service.call_context import call_context
+from service.call_feed import call_feed
+from service.post_call import post_call_queue
+from service.scheduler import callback_dispatcher
+from service.status_buffer import status_buffer
+from service.warmup import warmup
 
 
 @app.on_event("startup")
 async def startup():
     await init_db()
-    # await loader.start()
+    if database.client:
+        await audit_query_plans()
+        await recover_interrupted_campaigns()
+        call_feed.start()
+        post_call_queue.start()
+        callback_dispatcher.start()
+        status_buffer.start()
+    await init_twilio_client()
+    init_twiml_template()
+    # Import the bot stack and load the VAD model in the background;
+    # /health reports ready once every step has succeeded
+    warmup.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await callback_dispatcher.stop()
+    await status_buffer.stop()
+    await call_feed.stop()
+    await post_call_queue.stop()
+    from service.vad import vad_service
+
+    vad_service.stop()
+    await close_twilio_client()
 
 
 app.include_router(health_router)
 app.include_router(user_router)
+app.include_router(campaign_router)
 
 
 @app.post("/start", response_model=DialoutResponse)
@@ -87,135 +113,68 @@ async def handle_dialout_request(request: Request) -> DialoutResponse:
 async def twilio_call_status(request: Request):
     """
     Handle Twilio call status updates.
+
+    Events can arrive out of order; each one is applied only if it is newer
+    (by SequenceNumber and status precedence) than what is stored. Updates
+    are queued and written in batches, so Twilio is acknowledged without
+    waiting on the database.
     """
 
     form_data = await request.form()
-    logger.info(f"Twilio Status Body: {dict(form_data)}")
+    logger.debug(f"Twilio Status Body: {dict(form_data)}")
 
-    call_status = form_data.get("CallStatus")
-    call_duration = form_data.get("CallDuration")
-    timestamp = form_data.get("Timestamp")
-
-    logger.info(
-        f"Extracted -> Status: {call_status}, Duration: {call_duration}, Time: {timestamp}"
-    )
-
-    call_sid = form_data.get("CallSid")
-    if call_sid:
-        user = await User.find_one(User.call_sid == call_sid)
-        if user:
-            user.status = call_status
-            try:
-                user.Duration = int(call_duration) if call_duration else 0
-            except ValueError:
-                user.Duration = 0
-
-            # Mapping based on request: CallerCountry mapped to CallerCountry (assuming typo in request asking for CallerCity)
-            user.CallerCountry = form_data.get("CallerCountry")
-            user.CallerZip = form_data.get("CallerZip")
-            user.FromCountry = form_data.get("FromCountry")
-
-            await user.save()
-            logger.info(f"Updated user {user.id} call status to {call_status}")
-        else:
-            logger.warning(f"No user found for CallSid {call_sid}")
+    # Coalesced per call_sid and flushed with bulk_write; stale or duplicate
+    # events are no-ops
+    await status_buffer.submit(form_data)
 
     # call_status = await parse_twilio_call_status(request)
 
     return JSONResponse(content={"status": "success"})
 
 
-@app.post("/upload")
-async def upload_excel(file: UploadFile = File(...)):
+@app.post("/upload", status_code=202)
+async def upload_excel(file: UploadFile = File(...), allow_redial: bool = False):
     """
-    Upload an Excel file, parse content, and initiate calls.
+    Upload an Excel or CSV file and start a campaign dialing its rows.
     Expects columns: name, phoneno, email
-    """
-    logger.info(f"Received file upload: {file.filename}")
 
-    # Read the file content
-    content = await file.read()
+    Duplicate numbers in the file are dialed once, and numbers that were
+    already called are skipped unless ``allow_redial`` is set.
 
-    # Parse the excel file
-    data = parse_excel_file(content)
+    Returns immediately with the campaign id; dialing runs in the background
+    and progress is available from GET /campaigns/{id}.
+    """
+    logger.info(f"Received file upload: {file.filename}")
 
-    # Get from_number from env
-    from_number = os.getenv("TWILIO_FROM_NUMBER")
+    # Get from_number from the Twilio config resolved at startup
+    try:
+        from_number = get_twilio_config().from_number
+    except ValueError as e:
+        logger.error(f"Twilio is not configured: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"message": f"Server misconfiguration: {e}"},
+        )
     if not from_number:
         logger.error("TWILIO_FROM_NUMBER not set in environment")
         return JSONResponse(
             status_code=500,
-            content={
-                "message": "Server misconfiguration: TWILIO_FROM_NUMBER not set",
-                "data": data,
-            },
+            content={"message": "Server misconfiguration: TWILIO_FROM_NUMBER not set"},
         )
-    results = []
-
-    for row in data:
-        to_number = row.get("phoneno")
-        # Ensure number passes basic validity check (e.g. not None)
-        # Detailed validation handled by Twilio or make_twilio_call logic
-
-        if to_number:
-            try:
-                # Need to cast to string just in case pandas inferred int
-                to_number = str(to_number).strip()
-
-                if not to_number.startswith("+"):
-                    to_number = f"+91{to_number}"
-
-                dialout_req = DialoutRequest(
-                    to_number=to_number, from_number=from_number
-                )
-                call_result = await make_twilio_call(dialout_req)
-
-                # Save to MongoDB
-                try:
-                    user_record = User(
-                        name=row.get("name", "Unknown"),
-                        email=row.get("email", ""),
-                        phonenumber=to_number,
-                        call_sid=call_result.call_sid,
-                        status=CallStatus.RINGING,
-                    )
-                    await user_record.insert()
-                    logger.info(
-                        f"Saved user {row.get('name')} to DB with SID {call_result.call_sid}"
-                    )
-                except Exception as db_e:
-                    logger.error(f"Failed to save user to DB: {db_e}")
-
-                results.append(
-                    {
-                        "name": row.get("name"),
-                        "phoneno": to_number,
-                        "status": "initiated",
-                        "call_sid": call_result.call_sid,
-                    }
-                )
-
-            except Exception as e:
-                logger.error(f"Failed to initiate call to {to_number}: {e}")
-                results.append(
-                    {
-                        "name": row.get("name"),
-                        "phoneno": to_number,
-                        "status": "failed",
-                        "error": str(e),
-                    }
-                )
-        else:
-            results.append(
-                {
-                    "name": row.get("name"),
-                    "phoneno": None,
-                    "status": "skipped",
-                    "error": "No phone number",
-                }
-            )
-
-    return JSONResponse(content={"results": results, "data": data})
+
+    # Read the file content
+    content = await file.read()
+
+    campaign = await start_campaign(content, file.filename, from_number, allow_redial)
+
+    return JSONResponse(
+        status_code=202,
+        content={
+            "campaign_id": str(campaign.id),
+            "status": campaign.status.value,
+            "progress_url": f"/campaigns/{campaign.id}",
+        },
+    )
 
 
 @app.post("/twiml")
@@ -224,7 +183,8 @@ async def get_twiml(request: Request) -> HTMLResponse:
 
     This endpoint is called by Twilio when a call is initiated. It returns TwiML
     that instructs Twilio to connect the call to our WebSocket endpoint with
-    stream parameters containing call metadata.
+    stream parameters containing call metadata. The TwiML is rendered from a
+    template compiled at startup.
 
     Args:
         request (Request): FastAPI request containing Twilio form data with 'To' and 'From'.
@@ -236,7 +196,11 @@ async def get_twiml(request: Request) -> HTMLResponse:
 
     twiml_request = await parse_twiml_request(request)
 
-    twiml_content = generate_twiml(twiml_request)
+    # Load the call's context while Twilio connects the media stream
+    call_context.prefetch(twiml_request.call_sid)
+    twiml_content = get_twiml_template().render(
+        twiml_request, call_context.stream_parameters(twiml_request.call_sid)
+    )
 
     return HTMLResponse(content=twiml_content, media_type="application/xml")
 
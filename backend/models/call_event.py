@@ -0,0 +1,42 @@
+import os
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from beanie import Document, Granularity, TimeSeriesConfig
+from pydantic import Field
+
+
+class CallEventSource(str, Enum):
+    WEBHOOK = "webhook"
+    BOT = "bot"
+    ANALYSIS = "analysis"
+
+
+class CallEvent(Document):
+    """One entry in a call's append-only lifecycle log.
+
+    Stored in a time-series collection bucketed by ``call_sid`` and expired
+    after ``CALL_EVENT_TTL_DAYS`` days.
+    """
+
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    call_sid: str
+    source: CallEventSource
+    event: str
+    data: dict[str, Any] = Field(default_factory=dict)
+
+    class Settings:
+        name = "call_event"
+
+        timeseries = TimeSeriesConfig(
+            time_field="timestamp",
+            meta_field="call_sid",
+            granularity=Granularity.seconds,
+            expire_after_seconds=int(os.getenv("CALL_EVENT_TTL_DAYS", "90")) * 86400,
+        )
+
+        indexes = [
+            # Timeline lookups
+            [("call_sid", 1), ("timestamp", 1)],
+        ]
@@ -0,0 +1,70 @@
+from beanie import Document, PydanticObjectId
+from pydantic import Field
+from enum import Enum
+from datetime import datetime
+from typing import Optional
+
+
+class CampaignStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    # The process running it stopped before it finished
+    INTERRUPTED = "interrupted"
+
+
+class CampaignRowStatus(str, Enum):
+    QUEUED = "queued"
+    INITIATED = "initiated"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+class Campaign(Document):
+    """A bulk upload whose rows are dialed in the background.
+
+    While it runs, its ``host`` refreshes ``updatedAt`` every
+    ``CAMPAIGN_HEARTBEAT`` seconds, so a campaign whose process died can be
+    told apart from one that is still dialing.
+    """
+
+    filename: Optional[str] = None
+    host: Optional[str] = None
+    status: CampaignStatus = CampaignStatus.PENDING
+    total_rows: int = 0
+    queued: int = 0
+    initiated: int = 0
+    failed: int = 0
+    skipped: int = 0
+    dials_per_second: Optional[float] = None
+    db_round_trips: int = 0
+    error: Optional[str] = None
+
+    createdAt: datetime = Field(default_factory=datetime.utcnow)
+    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+    finishedAt: Optional[datetime] = None
+
+    class Settings:
+        name = "campaign"
+
+
+class CampaignRow(Document):
+    """Result of one spreadsheet row of a campaign."""
+
+    campaign_id: PydanticObjectId
+    row_number: int
+    name: Optional[str] = None
+    phoneno: Optional[str] = None
+    email: Optional[str] = None
+    status: CampaignRowStatus = CampaignRowStatus.QUEUED
+    call_sid: Optional[str] = None
+    error: Optional[str] = None
+
+    class Settings:
+        name = "campaign_row"
+
+        indexes = [
+            [("campaign_id", 1), ("row_number", 1)],
+            [("campaign_id", 1), ("status", 1), ("row_number", 1)],
+        ]
@@ -0,0 +1,60 @@
+import os
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
+
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+
+class PostCallJobKind(str, Enum):
+    ANALYSIS = "analysis"
+    RECORDING = "recording"
+
+
+class PostCallJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class PostCallJob(Document):
+    """Work left over when a call ends, kept until a worker completes it.
+
+    A ``running`` job whose ``locked_until`` has passed belonged to a worker
+    that died and is picked up again; its worker renews ``locked_until``
+    while the job runs. A job with a ``host`` needs a file
+    only that host has (a local recording) and is only claimed there.
+    Finished jobs expire after ``POST_CALL_JOB_TTL_DAYS`` days.
+    """
+
+    kind: PostCallJobKind
+    call_sid: str
+    payload: dict[str, Any] = Field(default_factory=dict)
+    host: Optional[str] = None
+    status: PostCallJobStatus = PostCallJobStatus.PENDING
+    attempts: int = 0
+    run_after: datetime = Field(default_factory=datetime.utcnow)
+    locked_until: Optional[datetime] = None
+    # Set per claim; only the holder may renew the lease or record a result
+    lease_owner: Optional[str] = None
+    error: Optional[str] = None
+
+    createdAt: datetime = Field(default_factory=datetime.utcnow)
+    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+    finishedAt: Optional[datetime] = None
+
+    class Settings:
+        name = "post_call_job"
+
+        indexes = [
+            # Worker claims
+            [("status", 1), ("host", 1), ("run_after", 1)],
+            [("status", 1), ("host", 1), ("locked_until", 1)],
+            IndexModel(
+                [("finishedAt", ASCENDING)],
+                expireAfterSeconds=int(os.getenv("POST_CALL_JOB_TTL_DAYS", "7")) * 86400,
+            ),
+        ]
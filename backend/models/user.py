@@ -1,6 +1,7 @@
 # database schema  in this pdf
 
-from beanie import Document
+from beanie import Document, Replace, Save, SaveChanges, before_event
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from pydantic import EmailStr, Field
 from enum import Enum
 from datetime import datetime
@@ -23,7 +24,7 @@ class CallStatus(str, Enum):
 
 class User(Document):
     name: str
-    email: EmailStr
+    email: Optional[EmailStr] = None
     phonenumber: str
     call_sid: str
     Transcript: str | None = None
@@ -39,15 +40,32 @@ class User(Document):
     Outcome: str | None = None
     time_to_call: Optional[datetime] = None
     status: CallStatus = CallStatus.PENDING
+    # SequenceNumber of the last applied Twilio status callback
+    status_sequence: Optional[int] = None
 
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
 
+    @before_event(Replace, Save, SaveChanges)
+    def touch(self):
+        # Raw update_one/bulk_write paths set updatedAt in their own $set
+        self.updatedAt = datetime.utcnow()
+
     class Settings:
         name = "user"  # MongoDB collection name
 
         indexes = [
             "email",  # unique index handled below
+            # Status webhook, bot and recording lookups
+            IndexModel([("call_sid", ASCENDING)], unique=True),
+            # /users/calls pages newest first on (createdAt, _id)
+            IndexModel([("createdAt", DESCENDING), ("_id", DESCENDING)]),
+            # Scheduled callback dispatcher
+            IndexModel([("status", ASCENDING), ("time_to_call", ASCENDING)]),
+            # Lead dedupe ($in on phonenumber) and per-number call history
+            IndexModel([("phonenumber", ASCENDING), ("createdAt", DESCENDING)]),
+            # /users/calls?since= delta sync
+            IndexModel([("updatedAt", ASCENDING), ("_id", ASCENDING)]),
         ]
 
     class Config:
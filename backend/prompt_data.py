@@ -1,3 +1,7 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+
 def get_prompt(STUDENT_NAME):
     return f"""
    ## 🎧 HUMAN VOICE COUNSELLOR MODE (ENGLISH–HINDI / HINGLISH)
@@ -312,8 +316,9 @@ def get_prompt(STUDENT_NAME):
    """
 
 
-def get_prompt(STUDENT_NAME):
-    return f"""
+# Kept byte-identical across calls so the LLM provider can reuse its cached
+# prefix; everything that varies per call goes in call_details() instead.
+COUNSELLOR_PROMPT = """
    SYSTEM PROMPT — HUMAN VOICE COUNSELLOR MODE
          You are NOT a chatbot.
          You are a REAL education counsellor talking on a phone call.
@@ -333,6 +338,10 @@ def get_prompt(STUDENT_NAME):
          You NEVER introduce all details.
          You speak naturally, like a human on a call.
 
+         The student's name and the current local time are in the
+         CALL DETAILS message after this prompt. Wherever these lines
+         say [student name], use that name.
+
          ════════════════════════════
          CRITICAL HUMAN SPEECH RULES
          ════════════════════════════
@@ -367,7 +376,7 @@ def get_prompt(STUDENT_NAME):
          ════════════════════════════
          CALL OPENING (VERY NATURAL)
          ════════════════════════════
-         “Hello, {STUDENT_NAME} this is Riya calling from India Global Education Network.
+         “Hello, [student name] this is Riya calling from India Global Education Network.
          You had shown interest in studying in India for your bachelor’s degree,
          so I’m calling to guide you properly.
          Is this a good time to talk?”
@@ -379,10 +388,10 @@ def get_prompt(STUDENT_NAME):
          ════════════════════════════
          INTEREST CHECK (SOFT)
          ════════════════════════════
-         “Just to understand, {STUDENT_NAME} are you planning to do your bachelor’s degree in India?”
+         “Just to understand, [student name] are you planning to do your bachelor’s degree in India?”
 
          If NO:
-         “That’s completely okay, {STUDENT_NAME}.
+         “That’s completely okay, [student name].
          Thank you for your time.
          If you ever need guidance later, you can contact us at 7782827701.
          We also help students with scholarships.”
@@ -414,7 +423,7 @@ def get_prompt(STUDENT_NAME):
          Acknowledge → then add value → then ask why.
 
          Example:
-         “Okay,{STUDENT_NAME} computer science. That’s a good choice.
+         “Okay,[student name] computer science. That’s a good choice.
          Many students like it because it has good career scope,
          technology jobs, and future growth.
          What made you interested in this field?”
@@ -553,3 +562,34 @@ def get_prompt(STUDENT_NAME):
          You are a REAL human counsellor on a phone call.
 
    """
+
+# Students are called in India; local time lets the counsellor greet and
+# offer callbacks sensibly.
+CALL_TIMEZONE = timezone(timedelta(hours=5, minutes=30), "IST")
+
+
+def call_details(student_name: str, now: Optional[datetime] = None) -> str:
+    """The small per-call message that follows ``COUNSELLOR_PROMPT``."""
+    now = (now or datetime.now(timezone.utc)).astimezone(CALL_TIMEZONE)
+    return (
+        "CALL DETAILS\n"
+        f"Student name: {student_name}\n"
+        f"Local time: {now:%A %d %B %Y, %I:%M %p} {now.tzname()}"
+    )
+
+
+def get_messages(student_name: str, now: Optional[datetime] = None) -> list[dict]:
+    """System messages for a call: the static prompt first, call details last.
+
+    Args:
+        student_name (str): Name of the student being called.
+        now (datetime): Current time; defaults to now.
+    """
+    return [
+        {"role": "system", "content": COUNSELLOR_PROMPT},
+        {"role": "system", "content": call_details(student_name, now)},
+    ]
+
+
+def get_prompt(STUDENT_NAME):
+    return COUNSELLOR_PROMPT + "\n" + call_details(STUDENT_NAME)
@@ -0,0 +1,46 @@
+# Campaign progress routes
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from beanie import PydanticObjectId
+from models.campaign import Campaign, CampaignRow, CampaignRowStatus
+
+
+router = APIRouter(prefix="/campaigns", tags=["Campaigns"])
+
+
+@router.get("/{id}")
+async def get_campaign(
+    id: str,
+    after: int = Query(0, ge=0, description="Return rows after this row number"),
+    limit: int = Query(50, ge=1, le=500),
+    status: Optional[CampaignRowStatus] = None,
+):
+    """Get campaign progress counters and a page of per-row results.
+
+    Rows are ordered by spreadsheet row number; pass the returned
+    ``next_after`` as ``after`` to fetch the next page.
+    """
+    try:
+        campaign_id = PydanticObjectId(id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid ID format")
+
+    campaign = await Campaign.get(campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+    query = CampaignRow.find(
+        CampaignRow.campaign_id == campaign_id,
+        CampaignRow.row_number > after,
+    )
+    if status:
+        query = query.find(CampaignRow.status == status)
+    rows = await query.sort("+row_number").limit(limit).to_list()
+
+    return {
+        "campaign": campaign,
+        "rows": rows,
+        "next_after": rows[-1].row_number if len(rows) == limit else None,
+    }
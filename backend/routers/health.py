@@ -1,21 +1,47 @@
 from fastapi import APIRouter
-from core.database import client
+from fastapi.responses import JSONResponse
+
+from core import database
+from service.call_context import call_context
+from service.call_feed import call_feed
+from service.call_metrics import call_metrics
+from service.post_call import post_call_queue
+from service.status_buffer import status_buffer
+from service.user_cache import user_cache
+from service.warmup import warmup
 
 health_router = APIRouter(tags=["Health"])
 
 @health_router.get("/health")
 async def health_check():
     try:
-        # Check MongoDB connection
-        if client:
-            await client.admin.command("ping")
+        # Check MongoDB connection; read through the module, since the client
+        # is only created by init_db at startup
+        if database.client:
+            await database.client.admin.command("ping")
             db_status = "connected"
         else:
             db_status = "not initialized"
-            
+
+        # Not ready (503) until every warm-up step has succeeded
+        if not warmup.ready:
+            return JSONResponse(
+                status_code=503,
+                content={
+                    "status": "failed" if warmup.finished else "starting",
+                    "ready": False,
+                    "database": db_status,
+                    "failed_step": warmup.failed_step,
+                    "errors": warmup.errors,
+                    "warmup": warmup.timings_ms,
+                },
+            )
+
         return {
             "status": "ok",
-            "database": db_status
+            "ready": True,
+            "database": db_status,
+            "warmup": warmup.timings_ms,
         }
     except Exception as e:
         return {
@@ -23,3 +49,20 @@ async def health_check():
             "database": "disconnected",
             "detail": str(e)
         }
+
+
+@health_router.get("/metrics")
+async def metrics():
+    # Imported here so the health router does not pull in the VAD stack
+    from service.vad import vad_service
+
+    return {
+        "vad": vad_service.stats(),
+        "status_buffer": status_buffer.stats(),
+        "call_feed": call_feed.stats(),
+        "call_context": call_context.stats(),
+        "post_call": post_call_queue.stats(),
+        "user_cache": user_cache.stats(),
+        "calls": call_metrics.stats(),
+        "warmup": warmup.stats(),
+    }
@@ -1,10 +1,24 @@
 # API routes
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+import base64
+import hashlib
+import os
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from beanie import PydanticObjectId
+from core.responses import ORJSONResponse
 from models.user import User
-from schemas.user import UserCreate, UserResponse
-from core.database import client
+from schemas.user import CallDetail, CallSummary, UserCreate, UserResponse
+from service.call_context import call_context
+from service.call_events import get_timeline
+from service.call_feed import call_feed, format_sse
+from service.stats import get_call_stats
+from service.user_cache import get_user_by_id, invalidate_user
+from core import database
 
 
 router = APIRouter(prefix="/users", tags=["Users"])
@@ -25,34 +39,206 @@ async def get_users():
 @router.get("/health")
 async def health_check():
     try:
-        await client.admin.command("ping")
+        await database.client.admin.command("ping")
         return {"status": "ok", "db": "connected"}
     except Exception:
         return {"status": "error", "db": "not connected"}
 
 
+def _encode_cursor(timestamp: datetime, call_id: PydanticObjectId) -> str:
+    raw = f"{timestamp.isoformat()}|{call_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, PydanticObjectId]:
+    try:
+        timestamp, call_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), PydanticObjectId(call_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# How far each since= poll looks back before the client's since
+SYNC_LOOKBACK = timedelta(seconds=float(os.getenv("SYNC_LOOKBACK_SECONDS", "10")))
+
+
+def _etag(*parts: object) -> str:
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 response if the client's If-None-Match already has this ETag."""
+    if_none_match = request.headers.get("if-none-match", "")
+    tags = {tag.strip() for tag in if_none_match.split(",")}
+    if etag in tags or "*" in tags:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    return None
+
+
 @router.get("/calls")
-async def get_all_calls():
-    """Get all calls sorted by date (newest first)."""
-    return await User.find_all().sort("-createdAt").to_list()
+async def get_all_calls(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    status: Optional[List[str]] = Query(None),
+    outcome: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    include_text: bool = False,
+    since: Optional[datetime] = None,
+):
+    """Get a page of calls sorted by date (newest first).
+
+    Pages are keyed on ``(createdAt, _id)``: pass the returned ``next_cursor``
+    back as ``cursor`` to fetch the next page. Transcript and Analysis are left
+    out unless ``include_text`` is set.
+
+    With ``since``, calls updated after that time are returned, oldest
+    change first and keyed on ``(updatedAt, _id)``. Once ``next_cursor`` is
+    null, pass ``next_since`` as ``since`` on the next poll. ``updatedAt`` is
+    stamped by the writing replica before its write commits, so each poll
+    also looks ``SYNC_LOOKBACK_SECONDS`` back before ``since`` to catch late
+    commits and clock skew between replicas; clients drop items whose
+    ``(_id, updatedAt)`` they already have.
+
+    Responses carry an ETag; a matching ``If-None-Match`` gets a 304.
+    """
+    query: dict = {}
+    if status:
+        query["status"] = {"$in": status}
+    if outcome:
+        query["Outcome"] = outcome
+    if created_from or created_to:
+        query["createdAt"] = {}
+        if created_from:
+            query["createdAt"]["$gte"] = created_from
+        if created_to:
+            query["createdAt"]["$lt"] = created_to
+
+    if since:
+        if since.tzinfo:
+            since = since.astimezone(timezone.utc).replace(tzinfo=None)
+        query["updatedAt"] = {"$gt": since - SYNC_LOOKBACK}
+        key, direction = "updatedAt", 1
+    else:
+        key, direction = "createdAt", -1
+    if cursor:
+        timestamp, call_id = _decode_cursor(cursor)
+        after = "$gt" if direction == 1 else "$lt"
+        query = {
+            "$and": [
+                query,
+                {
+                    "$or": [
+                        {key: {after: timestamp}},
+                        {key: timestamp, "_id": {after: call_id}},
+                    ]
+                },
+            ]
+        }
+
+    projection = CallDetail if include_text else CallSummary
+    calls = (
+        await User.find(query)
+        .sort([(key, direction), ("_id", direction)])
+        .limit(limit)
+        .project(projection)
+        .to_list()
+    )
+
+    # Checked before serialising, so an unchanged page costs only the query
+    etag = _etag(
+        request.url.query, *(f"{call.id}:{call.updatedAt.isoformat()}" for call in calls)
+    )
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+
+    last = calls[-1] if len(calls) == limit else None
+    body = {
+        "items": calls,
+        "next_cursor": _encode_cursor(getattr(last, key), last.id) if last else None,
+    }
+    if since:
+        body["next_since"] = max((call.updatedAt for call in calls), default=since)
+
+    # Returned directly so the page skips FastAPI's jsonable_encoder pass
+    return ORJSONResponse(body, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+@router.get("/calls/stream")
+async def stream_calls(request: Request):
+    """Stream per-call deltas (status, duration, score, outcome) as Server-Sent Events.
+
+    Each event is a JSON object with ``type`` ("insert" or "update"), the
+    call's ``_id`` and/or ``call_sid``, and only the fields that changed.
+    """
+
+    async def events():
+        queue = call_feed.subscribe()
+        try:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    delta = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(delta)
+        finally:
+            call_feed.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stats")
+async def get_stats(
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+):
+    """Get aggregated call statistics (counts, averages, per-day volumes)."""
+    return await get_call_stats(created_from, created_to)
 
 
 @router.get("/call/{id}")
-async def get_call_by_id(id: str):
-    """Get a specific call by ID."""
+async def get_call_by_id(id: str, request: Request):
+    """Get a specific call by ID.
+
+    Responses carry an ETag; a matching ``If-None-Match`` gets a 304.
+    """
     try:
-        user = await User.get(PydanticObjectId(id))
+        user = await get_user_by_id(id)
     except Exception:
         raise HTTPException(status_code=400, detail="Invalid ID format")
 
     if not user:
         raise HTTPException(status_code=404, detail="Call not found")
-    return user
+
+    etag = _etag(user.id, user.updatedAt.isoformat())
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    return ORJSONResponse(user, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+@router.get("/timeline/{call_sid}")
+async def get_call_timeline(call_sid: str):
+    """Get every recorded webhook, bot and analysis event for a call, oldest first."""
+    events = await get_timeline(call_sid)
+    if not events:
+        raise HTTPException(status_code=404, detail="No events for this call")
+    return {"call_sid": call_sid, "events": events}
 
 
 import os
-from server_utils import make_twilio_call, DialoutRequest
+from server_utils import make_twilio_call, DialoutRequest, get_twilio_config
 from models.user import CallStatus
+from service.phone import normalize_phone
 
 
 @router.post("/redial/{id}")
@@ -60,18 +246,21 @@ async def redial_user(id: str):
     """Redial a user by their ID."""
     try:
         # Find original user record
-        original_user = await User.get(PydanticObjectId(id))
+        original_user = await get_user_by_id(id)
         if not original_user:
             raise HTTPException(status_code=404, detail="User not found")
 
-        # Get from_number from env
-        from_number = os.getenv("TWILIO_FROM_NUMBER")
+        # Get from_number from the Twilio config resolved at startup
+        from_number = get_twilio_config().from_number
         if not from_number:
             raise HTTPException(status_code=500, detail="TWILIO_FROM_NUMBER not set")
 
-        to_number = original_user.phonenumber
-        if not to_number:
+        if not original_user.phonenumber:
             raise HTTPException(status_code=400, detail="User has no phone number")
+        # Records from before E.164 ingestion may hold raw sheet values
+        to_number = normalize_phone(original_user.phonenumber)
+        if not to_number:
+            raise HTTPException(status_code=400, detail="User has an invalid phone number")
 
         # Initiate call
         dialout_req = DialoutRequest(to_number=to_number, from_number=from_number)
@@ -86,6 +275,9 @@ async def redial_user(id: str):
             status=CallStatus.RINGING,
         )
         await new_user.insert()
+        invalidate_user(new_user.call_sid, new_user.id)
+        call_feed.publish_insert(new_user)
+        call_context.put(new_user)
 
         return {
             "status": "initiated",
@@ -99,83 +291,22 @@ async def redial_user(id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-from datetime import datetime, timezone, timedelta
+from service.scheduler import callback_dispatcher
 
 
 @router.patch("/{id}/timestamp")
 async def update_timestamp(id: str):
     """Update user's time_to_call to current UTC time."""
     try:
-        user = await User.get(PydanticObjectId(id))
+        user = await get_user_by_id(id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
         user.time_to_call = datetime.now(timezone.utc)
         await user.save()
+        invalidate_user(user.call_sid, user.id)
+        callback_dispatcher.notify()
 
         return {"message": "Timestamp updated", "time_to_call": user.time_to_call}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-
-
-# async def check_scheduled_calls():
-#     """Check for scheduled calls and initiate them."""
-#     try:
-#         now = datetime.now(timezone.utc)
-#         print(f"DEBUG: Checking for calls at UTC: {now}")
-
-#         # Debug: Check any user with time_to_call set
-#         users_with_time = await User.find(User.time_to_call != None).to_list()
-#         print(f"DEBUG: Total users with time_to_call set: {len(users_with_time)}")
-#         for u in users_with_time:
-#             print(
-#                 f"DEBUG: Found User: {u.name}, Status: '{u.status}', Time: {u.time_to_call}"
-#             )
-
-#         # "Ignore seconds" => check if time_to_call is within the current minute
-#         # We check: start_of_minute <= time_to_call < start_of_next_minute
-#         start_of_minute = now.replace(second=0, microsecond=0)
-#         end_of_minute = start_of_minute + timedelta(minutes=1)
-
-#         print(f"DEBUG: Matching window: {start_of_minute} <= time < {end_of_minute}")
-
-#         scheduled_users = await User.find(
-#             User.time_to_call >= start_of_minute,
-#             User.time_to_call < end_of_minute,
-#         ).to_list()
-
-#         if scheduled_users:
-#             print(f"Found {len(scheduled_users)} scheduled calls.")
-#             from_number = os.getenv("TWILIO_FROM_NUMBER")
-
-#             for user in scheduled_users:
-#                 if user.phonenumber and from_number:
-#                     try:
-#                         print(f"Initiating callback for {user.name}")
-#                         dialout_req = DialoutRequest(
-#                             to_number=user.phonenumber, from_number=from_number
-#                         )
-#                         print("Initiating Twilio Call...")
-#                         call_result = await make_twilio_call(dialout_req)
-
-#                         # Create NEW user record for this call
-#                         new_user = User(
-#                             name=user.name,
-#                             email=user.email,
-#                             phonenumber=user.phonenumber,
-#                             call_sid=call_result.call_sid,
-#                             status=CallStatus.RINGING,
-#                         )
-#                         await new_user.insert()
-
-#                         # Mark original request as COMPLETED so we don't call again
-#                         user.status = CallStatus.COMPLETED
-#                         user.time_to_call = None
-#                         await user.save()
-#                         print(f"Callback initiated for {user.name}")
-
-#                     except Exception as e:
-#                         print(f"Failed to callback {user.name}: {e}")
-
-#     except Exception as e:
-#         print(f"Error in check_scheduled_calls: {e}")
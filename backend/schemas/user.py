@@ -1,5 +1,9 @@
 # # Request / Response (Pydantic)
-from pydantic import BaseModel, EmailStr
+from datetime import datetime
+from typing import Optional
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 # from pydantic import BaseModel, EmailStr, AnyUrl, Field, Annotated
 # from typing import Dict, Optional, List
@@ -16,6 +20,38 @@ class UserResponse(BaseModel):
     email: EmailStr
 
 
+class CallSummary(BaseModel):
+    """List view of a call; leaves out the heavy Transcript/Analysis text."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: PydanticObjectId = Field(alias="_id")
+    name: str
+    email: Optional[str] = None
+    phonenumber: str
+    call_sid: str
+    status: str
+    Duration: Optional[int] = None
+    Quality_Score: Optional[int] = None
+    Recording_URL: Optional[str] = None
+    CallerCountry: Optional[str] = None
+    CallerZip: Optional[str] = None
+    ToCountry: Optional[str] = None
+    FromCountry: Optional[str] = None
+    Intent: Optional[str] = None
+    Outcome: Optional[str] = None
+    time_to_call: Optional[datetime] = None
+    createdAt: datetime
+    updatedAt: datetime
+
+
+class CallDetail(CallSummary):
+    """Call with its transcript and analysis."""
+
+    Transcript: Optional[str] = None
+    Analysis: Optional[str] = None
+
+
 # class UserResponse(BaseModel):
 #     id: str
 #     name: str = Field(max_length=100)
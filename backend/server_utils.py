@@ -5,10 +5,12 @@
 #
 
 import os
+from typing import Optional
 
 from fastapi import HTTPException, Request
 from loguru import logger
 from pydantic import BaseModel
+from twilio.http.async_http_client import AsyncTwilioHttpClient
 from twilio.rest import Client as TwilioClient
 from twilio.twiml.voice_response import Connect, Stream, VoiceResponse
 
@@ -60,10 +62,12 @@ class TwimlRequest(BaseModel):
     Attributes:
         to_number (str): The phone number being called.
         from_number (str): The phone number calling from.
+        call_sid (str): Twilio CallSid of the call, when known.
     """
 
     to_number: str
     from_number: str
+    call_sid: Optional[str] = None
 
 
 async def dialout_request_from_request(request: Request) -> DialoutRequest:
@@ -85,6 +89,117 @@ async def dialout_request_from_request(request: Request) -> DialoutRequest:
         raise HTTPException(status_code=400, detail=f"Invalid request data: {str(e)}")
 
 
+class TwilioConfig(BaseModel):
+    """Twilio credentials and callback URLs, resolved once at startup.
+
+    Attributes:
+        account_sid (str): Twilio account SID.
+        auth_token (str): Twilio auth token.
+        local_server_url (str): Public base URL of this server.
+        from_number (str | None): Default number to call from.
+    """
+
+    account_sid: str
+    auth_token: str
+    local_server_url: str
+    from_number: Optional[str] = None
+
+    @property
+    def twiml_url(self) -> str:
+        return f"{self.local_server_url}/twiml"
+
+    @property
+    def status_callback_url(self) -> str:
+        return f"{self.local_server_url}/twilio-call-status"
+
+
+STATUS_CALLBACK_EVENTS = [
+    "completed",
+    "queued",
+    "ringing",
+    "in-progress",
+    "failed",
+    "busy",
+    "no-answer",
+    "canceled",
+]
+
+_twilio_config: Optional[TwilioConfig] = None
+_twilio_client: Optional[TwilioClient] = None
+
+
+def load_twilio_config() -> TwilioConfig:
+    """Read the Twilio settings from the environment and cache them.
+
+    Returns:
+        TwilioConfig: The process-wide Twilio configuration.
+
+    Raises:
+        ValueError: If required environment variables are missing.
+    """
+    global _twilio_config
+
+    local_server_url = os.getenv("LOCAL_SERVER_URL")
+    if not local_server_url:
+        raise ValueError("Missing LOCAL_SERVER_URL")
+
+    account_sid = os.getenv("TWILIO_ACCOUNT_SID")
+    auth_token = os.getenv("TWILIO_AUTH_TOKEN")
+
+    if not account_sid or not auth_token:
+        raise ValueError("Missing Twilio credentials")
+
+    _twilio_config = TwilioConfig(
+        account_sid=account_sid,
+        auth_token=auth_token,
+        local_server_url=local_server_url.rstrip("/"),
+        from_number=os.getenv("TWILIO_FROM_NUMBER"),
+    )
+    return _twilio_config
+
+
+def get_twilio_config() -> TwilioConfig:
+    """Return the cached Twilio configuration, loading it on first use."""
+    return _twilio_config or load_twilio_config()
+
+
+def get_twilio_client() -> TwilioClient:
+    """Return the shared Twilio client.
+
+    The client sends requests through an aiohttp session with keep-alive
+    connection pooling, so dials reuse TLS connections and never block the
+    event loop. Must be called from inside the running event loop.
+    """
+    global _twilio_client
+
+    if _twilio_client is None:
+        config = get_twilio_config()
+        _twilio_client = TwilioClient(
+            config.account_sid,
+            config.auth_token,
+            http_client=AsyncTwilioHttpClient(),
+        )
+    return _twilio_client
+
+
+async def init_twilio_client() -> None:
+    """Resolve the Twilio configuration and build the shared client at startup."""
+    try:
+        get_twilio_client()
+        logger.info("Twilio client initialized")
+    except ValueError as e:
+        logger.warning(f"Twilio client not initialized: {e}")
+
+
+async def close_twilio_client() -> None:
+    """Close the shared client's HTTP session."""
+    global _twilio_client
+
+    if _twilio_client is not None:
+        await _twilio_client.http_client.close()
+        _twilio_client = None
+
+
 async def make_twilio_call(dialout_request: DialoutRequest) -> TwilioCallResult:
     """Initiate an outbound call via Twilio API.
 
@@ -105,35 +220,16 @@ async def make_twilio_call(dialout_request: DialoutRequest) -> TwilioCallResult:
     # from_number = dialout_request.from_number
     from_number = dialout_request.from_number
 
-    local_server_url = os.getenv("LOCAL_SERVER_URL")
-    if not local_server_url:
-        raise ValueError("Missing LOCAL_SERVER_URL")
+    config = get_twilio_config()
 
-    twiml_url = f"{local_server_url}/twiml"
-    account_sid = os.getenv("TWILIO_ACCOUNT_SID")
-    auth_token = os.getenv("TWILIO_AUTH_TOKEN")
-
-    if not account_sid or not auth_token:
-        raise ValueError("Missing Twilio credentials")
-
-    # Create Twilio client and make the call
-    client = TwilioClient(account_sid, auth_token)
-    call = client.calls.create(
+    # Make the call through the shared, pooled async client
+    call = await get_twilio_client().calls.create_async(
         to=to_number,
-        status_callback=os.getenv("LOCAL_SERVER_URL") + "/twilio-call-status",
+        status_callback=config.status_callback_url,
         status_callback_method="POST",
-        status_callback_event=[
-            "completed",
-            "queued",
-            "ringing",
-            "in-progress",
-            "failed",
-            "busy",
-            "no-answer",
-            "canceled",
-        ],
+        status_callback_event=STATUS_CALLBACK_EVENTS,
         from_=from_number,
-        url=twiml_url,
+        url=config.twiml_url,
         method="POST",
     )
 
@@ -158,7 +254,9 @@ async def parse_twiml_request(request: Request) -> TwimlRequest:
     # from_number = form_data.get("From")
     from_number = form_data.get("From")
 
-    return TwimlRequest(to_number=to_number, from_number=from_number)
+    return TwimlRequest(
+        to_number=to_number, from_number=from_number, call_sid=form_data.get("CallSid")
+    )
 
 
 def get_websocket_url() -> str:
@@ -222,3 +320,81 @@ def generate_twiml(twiml_request: TwimlRequest) -> str:
     response.pause(length=20)
 
     return str(response)
+
+
+def _escape_twiml_attribute(value: str) -> str:
+    """Escape an attribute value exactly as ``VoiceResponse`` does."""
+    return (
+        value.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+        .replace("\r", "&#13;")
+        .replace("\n", "&#10;")
+        .replace("\t", "&#09;")
+    )
+
+
+class TwimlTemplate:
+    """TwiML for the /twiml endpoint, compiled once and filled by concatenation.
+
+    The document is rendered once through ``generate_twiml`` with marker values
+    and split around them, so the output is byte-for-byte what
+    ``generate_twiml`` returns for the same numbers, without building and
+    serialising an XML tree per call. Extra per-call stream parameters are
+    inserted before ``</Stream>``.
+    """
+
+    _TO_MARKER = "__twiml_to_number__"
+    _FROM_MARKER = "__twiml_from_number__"
+
+    def __init__(self):
+        compiled = generate_twiml(
+            TwimlRequest(to_number=self._TO_MARKER, from_number=self._FROM_MARKER)
+        )
+        self.head, rest = compiled.split(self._TO_MARKER)
+        self.middle, rest = rest.split(self._FROM_MARKER)
+        self.stream_params, self.tail = rest.split("</Stream>")
+        self.tail = "</Stream>" + self.tail
+
+    def render(
+        self, twiml_request: TwimlRequest, parameters: Optional[dict[str, str]] = None
+    ) -> str:
+        """Fill in the call's numbers and optional extra stream parameters."""
+        extra = ""
+        if parameters:
+            extra = "".join(
+                f'<Parameter name="{_escape_twiml_attribute(name)}" '
+                f'value="{_escape_twiml_attribute(value)}" />'
+                for name, value in parameters.items()
+            )
+        return (
+            self.head
+            + _escape_twiml_attribute(twiml_request.to_number)
+            + self.middle
+            + _escape_twiml_attribute(twiml_request.from_number)
+            + self.stream_params
+            + extra
+            + self.tail
+        )
+
+
+_twiml_template: Optional[TwimlTemplate] = None
+
+
+def get_twiml_template() -> TwimlTemplate:
+    """Return the compiled TwiML template, compiling it on first use."""
+    global _twiml_template
+
+    if _twiml_template is None:
+        _twiml_template = TwimlTemplate()
+    return _twiml_template
+
+
+def init_twiml_template() -> None:
+    """Compile the TwiML template at startup."""
+    try:
+        get_twiml_template()
+        logger.info("TwiML template compiled")
+    except ValueError as e:
+        logger.warning(f"TwiML template not compiled: {e}")
@@ -9,7 +9,12 @@ from fastapi import Request, BackgroundTasks, HTTPException
 import cloudinary
 import cloudinary.uploader
 from cloudinary.utils import cloudinary_url
+from typing import Awaitable, Callable, Optional
+from models.call_event import CallEventSource
 from models.user import User
+from models.post_call_job import PostCallJobKind
+from service.call_session import CallSession
+from service.post_call import post_call_queue
 
 cloudinary.config(
     cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
@@ -19,33 +24,60 @@ cloudinary.config(
 )
 
 
-async def upload_file_to_cloud(file_path: str, call_id: str = None):
-    """Upload a single audio file to Cloudinary and remove it locally."""
-    if not file_path or not os.path.exists(file_path):
+async def upload_file_to_cloud(
+    file_path: str,
+    session: Optional[CallSession] = None,
+    uploaded_url: Optional[str] = None,
+    on_uploaded: Optional[Callable[[str], Awaitable[None]]] = None,
+):
+    """Upload a single audio file to Cloudinary and remove it locally.
+
+    The local file is only removed once the URL is saved, so a failed upload
+    can be retried. Pass the ``uploaded_url`` of an earlier attempt to only
+    save it; ``on_uploaded`` is awaited with a new URL before it is saved.
+    """
+    if not uploaded_url and (not file_path or not os.path.exists(file_path)):
         raise HTTPException(status_code=404, detail="Recording file not found")
 
     try:
-        result = cloudinary.uploader.upload(
-            file_path,
-            folder="AudioFile",
-            use_filename=True,
-            resource_type="auto",
-        )
-        secure_url = result.get("secure_url")
-        logger.info("Uploaded recording to Cloudinary: {}", secure_url)
+        secure_url = uploaded_url
+        if not secure_url:
+            # The Cloudinary SDK is blocking
+            result = await asyncio.to_thread(
+                cloudinary.uploader.upload,
+                file_path,
+                folder="AudioFile",
+                use_filename=True,
+                resource_type="auto",
+            )
+            secure_url = result.get("secure_url")
+            logger.info("Uploaded recording to Cloudinary: {}", secure_url)
+            if on_uploaded:
+                await on_uploaded(secure_url)
 
         # db_entry = await _persist_recording_url(secure_url)
-        if call_id:
-            user = await User.find_one(User.call_sid == call_id)
-            if user:
-                user.Recording_URL = secure_url
-                await user.save()
-                logger.info(f"Updated recording URL for user {user.id}")
+        if session:
+            if await session.load():
+                session.set(Recording_URL=secure_url)
+                if not await session.checkpoint("recording"):
+                    raise RuntimeError("Saving the recording URL failed")
+                await session.record_event(
+                    CallEventSource.BOT, "recording_uploaded", url=secure_url
+                )
+                logger.info(f"Updated recording URL for user {session.user.id}")
             else:
                 logger.warning(
-                    f"No user found for call_id {call_id} to save recording URL"
+                    f"No user found for call_id {session.call_sid} to save recording URL"
                 )
 
+        try:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        except OSError as cleanup_error:
+            logger.warning(
+                "Could not delete local recording %s: %s", file_path, cleanup_error
+            )
+
         return {
             "msg": "Audio uploaded successfully",
             "src": secure_url,
@@ -58,17 +90,12 @@ async def upload_file_to_cloud(file_path: str, call_id: str = None):
             status_code=422,
             detail=f"Cloud upload failed: {exc}",
         ) from exc
-    finally:
-        try:
-            os.remove(file_path)
-        except OSError as cleanup_error:
-            logger.warning(
-                "Could not delete local recording %s: %s", file_path, cleanup_error
-            )
 
 
-async def save_recording(buffer, audio, sample_rate, num_channels, call_id: str = None):
-    """Save audio locally and upload complete file to cloudinary."""
+async def save_recording(
+    buffer, audio, sample_rate, num_channels, session: Optional[CallSession] = None
+):
+    """Save audio locally and queue its upload to cloudinary."""
     # Ensure recordings directory exists
     recordings_dir = "recordings"
     if not os.path.exists(recordings_dir):
@@ -77,7 +104,8 @@ async def save_recording(buffer, audio, sample_rate, num_channels, call_id: str
 
     # Save audio file locally
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{recordings_dir}/conversation_{timestamp}.wav"
+    call_sid = session.call_sid if session else "unknown"
+    filename = f"{recordings_dir}/conversation_{call_sid}_{timestamp}.wav"
 
     # Create the WAV file
     with wave.open(filename, "wb") as wf:
@@ -86,4 +114,10 @@ async def save_recording(buffer, audio, sample_rate, num_channels, call_id: str
         wf.setframerate(sample_rate)
         wf.writeframes(audio)
 
-    await upload_file_to_cloud(filename, call_id)
+    # Uploaded by this host's post-call workers; the file stays on disk until
+    # it is done
+    job = await post_call_queue.enqueue(
+        PostCallJobKind.RECORDING, call_sid, local=True, path=filename
+    )
+    if job is None:
+        await upload_file_to_cloud(filename, session)
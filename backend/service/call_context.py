@@ -0,0 +1,121 @@
+import asyncio
+import os
+import statistics
+import time
+from collections import deque
+from typing import Any, Optional
+
+from loguru import logger
+
+from models.user import User
+from service.cache import TTLCache
+
+
+class _Context:
+    __slots__ = ("user", "task", "started", "load_ms")
+
+    def __init__(self, user: Optional[User] = None, task: Optional[asyncio.Task] = None):
+        self.user = user
+        self.task = task
+        self.started = time.perf_counter()
+        self.load_ms: Optional[float] = None
+
+
+class CallContextCache:
+    """Short-lived per-call context, loaded before the call's WebSocket opens.
+
+    The dialers ``put`` each call's User as soon as it is stored, and
+    ``/twiml`` calls ``prefetch`` so the lookup runs while Twilio is still
+    connecting the media stream. The bot then ``take``s the context instead
+    of querying MongoDB on its setup path; if a prefetch is still in flight it
+    waits only for the remainder.
+
+    Args:
+        ttl (float): Seconds a context is kept; defaults to
+            ``CALL_CONTEXT_TTL`` or 120.
+        maxsize (int): Maximum contexts held; defaults to
+            ``CALL_CONTEXT_SIZE`` or 1024.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, maxsize: Optional[int] = None):
+        self._contexts = TTLCache(
+            maxsize=maxsize or int(os.getenv("CALL_CONTEXT_SIZE", "1024")),
+            ttl=ttl or float(os.getenv("CALL_CONTEXT_TTL", "120")),
+        )
+        self.prefetches = 0
+        self.hits = 0
+        self.misses = 0
+        self._saved_ms: deque[float] = deque(maxlen=500)
+        self._waited_ms: deque[float] = deque(maxlen=500)
+
+    def put(self, user: User) -> None:
+        """Hold a freshly stored call's User so neither /twiml nor the bot reads it back."""
+        self._contexts.set(user.call_sid, _Context(user=user.model_copy()))
+
+    def prefetch(self, call_sid: Optional[str]) -> None:
+        """Start loading the call's User in the background, unless already held."""
+        if not call_sid or self._contexts.get(call_sid) is not None:
+            return
+        context = _Context()
+        context.task = asyncio.create_task(self._load(call_sid, context))
+        self._contexts.set(call_sid, context)
+        self.prefetches += 1
+
+    async def _load(self, call_sid: str, context: _Context) -> Optional[User]:
+        try:
+            context.user = await User.find_one(User.call_sid == call_sid)
+        except Exception as e:
+            logger.error(f"Prefetching context for call {call_sid} failed: {e}")
+        context.load_ms = (time.perf_counter() - context.started) * 1000
+        return context.user
+
+    def peek(self, call_sid: str) -> Optional[User]:
+        """The call's User if it is already loaded, without waiting."""
+        context = self._contexts.get(call_sid)
+        return context.user if context is not None else None
+
+    def stream_parameters(self, call_sid: Optional[str]) -> Optional[dict[str, str]]:
+        """Extra ``<Stream>`` parameters for values already known at /twiml time."""
+        user = self.peek(call_sid) if call_sid else None
+        if user is None or not user.name:
+            return None
+        return {"student_name": user.name}
+
+    async def take(self, call_sid: str) -> tuple[bool, Optional[User]]:
+        """Remove and return the call's context.
+
+        Returns:
+            tuple[bool, Optional[User]]: Whether a context was held, and its
+            User (None if the prefetch found no record or failed).
+        """
+        context = self._contexts.pop(call_sid)
+        if context is None:
+            self.misses += 1
+            return False, None
+
+        self.hits += 1
+        waited_ms = 0.0
+        if context.task is not None and not context.task.done():
+            started = time.perf_counter()
+            await asyncio.shield(context.task)
+            waited_ms = (time.perf_counter() - started) * 1000
+        self._waited_ms.append(waited_ms)
+        if context.load_ms is not None:
+            self._saved_ms.append(context.load_ms - waited_ms)
+        return True, context.user
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "held": self._contexts.stats()["size"],
+            "prefetches": self.prefetches,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "waited_ms_p50": round(statistics.median(self._waited_ms), 2) if self._waited_ms else None,
+            "saved_ms_p50": round(statistics.median(self._saved_ms), 2) if self._saved_ms else None,
+            "saved_ms_total": round(sum(self._saved_ms), 1),
+        }
+
+
+call_context = CallContextCache()
@@ -0,0 +1,80 @@
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Mapping, Optional
+
+from loguru import logger
+
+from models.call_event import CallEvent, CallEventSource
+
+
+def build_event(
+    call_sid: str,
+    source: CallEventSource,
+    event: str,
+    data: Optional[dict[str, Any]] = None,
+    timestamp: Optional[datetime] = None,
+) -> CallEvent:
+    return CallEvent(
+        timestamp=timestamp or datetime.utcnow(),
+        call_sid=call_sid,
+        source=source,
+        event=event,
+        data=data or {},
+    )
+
+
+def webhook_event(form: Mapping[str, Any]) -> Optional[CallEvent]:
+    """Turn a Twilio status callback into a ``CallEvent``.
+
+    Uses Twilio's own ``Timestamp`` when present so the timeline reflects when
+    the event happened rather than when it was delivered.
+    """
+    call_sid = form.get("CallSid")
+    if not call_sid:
+        return None
+
+    timestamp = None
+    if form.get("Timestamp"):
+        try:
+            timestamp = parsedate_to_datetime(form["Timestamp"]).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            pass
+
+    return build_event(
+        call_sid,
+        CallEventSource.WEBHOOK,
+        form.get("CallStatus") or "status",
+        {key: value for key, value in form.items() if key != "AccountSid"},
+        timestamp,
+    )
+
+
+async def record_events(events: list[CallEvent]) -> None:
+    """Append events with one unordered ``insert_many``.
+
+    Failures are logged and swallowed; the event log must never break the
+    call path.
+    """
+    if not events:
+        return
+    try:
+        await CallEvent.insert_many(events, ordered=False)
+    except Exception as e:
+        logger.warning(f"Could not record {len(events)} call events: {e}")
+
+
+async def record_event(
+    call_sid: Optional[str], source: CallEventSource, event: str, **data: Any
+) -> None:
+    """Append a single event to the call's timeline."""
+    if call_sid:
+        await record_events([build_event(call_sid, source, event, data)])
+
+
+async def get_timeline(call_sid: str) -> list[CallEvent]:
+    """Every recorded event for a call, oldest first."""
+    return (
+        await CallEvent.find(CallEvent.call_sid == call_sid)
+        .sort(+CallEvent.timestamp)
+        .to_list()
+    )
@@ -0,0 +1,146 @@
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from loguru import logger
+from pymongo.errors import OperationFailure, PyMongoError
+
+from models.user import User
+
+# Fields pushed to dashboards; anything else in an update is ignored.
+DELTA_FIELDS = ("status", "Duration", "Quality_Score", "Outcome")
+# Fields sent for a newly created call so dashboards can add its row.
+INSERT_FIELDS = ("call_sid", "name", "phonenumber", "status", "createdAt") + DELTA_FIELDS
+
+# Change streams need a replica set or sharded cluster.
+_CHANGE_STREAM_UNSUPPORTED = (40573, 40324)
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return value
+
+
+def _delta(kind: str, fields: dict[str, Any], keys: tuple[str, ...], **ids: Any) -> Optional[dict]:
+    delta = {key: _jsonable(fields[key]) for key in keys if key in fields}
+    if kind == "update" and not delta:
+        return None
+    delta.update({key: str(value) for key, value in ids.items() if value is not None})
+    delta["type"] = kind
+    return delta
+
+
+class CallFeed:
+    """Fans out compact per-call deltas to every connected dashboard.
+
+    One shared change stream on the ``user`` collection feeds all
+    subscribers, so the number of open dashboards does not change the load on
+    MongoDB. When change streams are unavailable (standalone server) the feed
+    falls back to an in-process bus fed by the write paths via ``publish``.
+    Slow subscribers lose their oldest deltas rather than blocking the feed.
+
+    Args:
+        queue_size (int): Deltas buffered per subscriber.
+    """
+
+    def __init__(self, queue_size: int = 256):
+        self.queue_size = queue_size
+        self.use_change_stream = False
+        self._subscribers: set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._resume_token: Optional[dict] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self.use_change_stream = True
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.use_change_stream = False
+
+    def _broadcast(self, delta: Optional[dict]) -> None:
+        if delta is None:
+            return
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(delta)
+
+    def publish(self, call_sid: str, **fields: Any) -> None:
+        """Push an update made by this process; a no-op when the change stream is live."""
+        if not self.use_change_stream:
+            self._broadcast(_delta("update", fields, DELTA_FIELDS, call_sid=call_sid))
+
+    def publish_insert(self, user: User) -> None:
+        """Push a newly created call; a no-op when the change stream is live."""
+        if not self.use_change_stream:
+            self._broadcast(
+                _delta("insert", user.model_dump(), INSERT_FIELDS, _id=user.id)
+            )
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a dashboard; deltas arrive on the returned queue."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def _from_change(self, change: dict) -> Optional[dict]:
+        document_id = change["documentKey"]["_id"]
+        if change["operationType"] in ("insert", "replace"):
+            kind = "insert" if change["operationType"] == "insert" else "update"
+            keys = INSERT_FIELDS if kind == "insert" else DELTA_FIELDS
+            return _delta(kind, change["fullDocument"], keys, _id=document_id)
+        updated = change.get("updateDescription", {}).get("updatedFields", {})
+        return _delta("update", updated, DELTA_FIELDS, _id=document_id)
+
+    async def _watch(self) -> None:
+        pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}]
+        while True:
+            try:
+                async with await User.get_pymongo_collection().watch(
+                    pipeline, resume_after=self._resume_token
+                ) as stream:
+                    logger.info("Call feed following the user change stream")
+                    async for change in stream:
+                        self._resume_token = stream.resume_token
+                        self._broadcast(self._from_change(change))
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                if e.code in _CHANGE_STREAM_UNSUPPORTED:
+                    logger.info("Change streams unavailable; call feed using in-process events")
+                    self.use_change_stream = False
+                    self._task = None
+                    return
+                logger.error(f"Call feed change stream failed: {e}")
+                await asyncio.sleep(5)
+            except PyMongoError as e:
+                logger.error(f"Call feed change stream failed: {e}")
+                await asyncio.sleep(5)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "source": "change_stream" if self.use_change_stream else "in_process",
+        }
+
+
+def format_sse(delta: dict) -> str:
+    return f"data: {json.dumps(delta)}\n\n"
+
+
+call_feed = CallFeed()
@@ -0,0 +1,97 @@
+import os
+import resource
+import statistics
+import time
+from collections import deque
+from typing import Any, Optional
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process, in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Peak rather than current RSS, but available everywhere (KB on Linux)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _percentile(values: list[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(pct) - 1]
+
+
+class CallMetrics:
+    """Per-call setup time, memory and database round trips, over the last
+    ``window`` calls.
+
+    ``setup_started`` is called when the WebSocket arrives and
+    ``setup_finished`` just before the pipeline starts running; the RSS growth
+    between the two is what setting up that call cost. ``call_ended`` records
+    how many database round trips the call's session made.
+
+    Args:
+        window (int): Number of recent calls kept for percentiles.
+    """
+
+    def __init__(self, window: int = 200):
+        self.active = 0
+        self.total = 0
+        self._pending: dict[str, tuple[float, int]] = {}
+        self._setup_ms: deque[float] = deque(maxlen=window)
+        self._rss_delta: deque[int] = deque(maxlen=window)
+        self._db_round_trips: deque[int] = deque(maxlen=window)
+        self._idle_rss = current_rss_bytes()
+
+    def setup_started(self, call_id: str) -> None:
+        if self.active == 0:
+            self._idle_rss = current_rss_bytes()
+        self.active += 1
+        self.total += 1
+        self._pending[call_id] = (time.perf_counter(), current_rss_bytes())
+
+    def setup_finished(self, call_id: str) -> Optional[float]:
+        """Record the call's setup time; returns it in milliseconds."""
+        started = self._pending.pop(call_id, None)
+        if started is None:
+            return None
+        started_at, rss_before = started
+        setup_ms = (time.perf_counter() - started_at) * 1000
+        self._setup_ms.append(setup_ms)
+        self._rss_delta.append(current_rss_bytes() - rss_before)
+        return setup_ms
+
+    def call_ended(self, call_id: str, db_round_trips: Optional[int] = None) -> None:
+        self._pending.pop(call_id, None)
+        if db_round_trips is not None:
+            self._db_round_trips.append(db_round_trips)
+        self.active = max(self.active - 1, 0)
+
+    def stats(self) -> dict[str, Any]:
+        setup = list(self._setup_ms)
+        round_trips = [float(n) for n in self._db_round_trips]
+        rss = current_rss_bytes()
+        return {
+            "active_calls": self.active,
+            "total_calls": self.total,
+            "setup_ms_p50": _percentile(setup, 50),
+            "setup_ms_p95": _percentile(setup, 95),
+            "setup_ms_max": max(setup) if setup else None,
+            "setup_rss_delta_kb_p50": (
+                _percentile([float(d) for d in self._rss_delta], 50) / 1024
+                if self._rss_delta
+                else None
+            ),
+            "db_round_trips_p50": _percentile(round_trips, 50),
+            "db_round_trips_max": int(max(round_trips)) if round_trips else None,
+            "rss_mb": round(rss / 2**20, 1),
+            "rss_per_active_call_kb": (
+                round((rss - self._idle_rss) / self.active / 1024, 1) if self.active else None
+            ),
+        }
+
+
+call_metrics = CallMetrics()
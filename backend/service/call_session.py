@@ -0,0 +1,110 @@
+import asyncio
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
+
+from loguru import logger
+
+from models.call_event import CallEventSource
+from models.user import User
+from service.call_context import call_context
+from service.call_events import record_event
+from service.call_feed import call_feed
+from service.user_cache import invalidate_user
+
+
+class CallSession:
+    """State for one live call, loaded once and written back at checkpoints.
+
+    The call's ``User`` is read on first use (from ``call_context`` when it
+    was prefetched) and kept for the rest of the call. Changes are staged
+    with ``set`` and written by ``checkpoint`` as a single ``$set`` of only
+    the changed fields, so a bot write cannot overwrite fields the status
+    webhook updated meanwhile. Every database
+    round trip made on the call's behalf is counted in ``db_round_trips``.
+
+    Args:
+        call_sid (str): Twilio CallSid of the call.
+    """
+
+    def __init__(self, call_sid: str):
+        self.call_sid = call_sid
+        self.user: Optional[User] = None
+        self.db_round_trips = 0
+        self._load_task: Optional[asyncio.Task] = None
+        self._pending: dict[str, Any] = {}
+        self._lock = asyncio.Lock()
+
+    async def load(self) -> Optional[User]:
+        """Return the call's User, reading it only the first time.
+
+        A context prefetched during /twiml is used when there is one; only
+        otherwise is MongoDB queried.
+        """
+        self.preload()
+        return await self._load_task
+
+    def preload(self) -> None:
+        """Start loading the User without waiting for it."""
+        if self._load_task is None:
+            self._load_task = asyncio.create_task(self._load())
+
+    async def _load(self) -> Optional[User]:
+        held, self.user = await call_context.take(self.call_sid)
+        if not held or self.user is None:
+            self.db_round_trips += 1
+            self.user = await User.find_one(User.call_sid == self.call_sid)
+        return self.user
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.user.name if self.user else None
+
+    def set(self, **fields: Any) -> None:
+        """Stage field changes for the next checkpoint."""
+        if self.user is not None:
+            for key, value in fields.items():
+                setattr(self.user, key, value)
+        self._pending.update(fields)
+
+    async def checkpoint(self, reason: str) -> bool:
+        """Write all staged changes with one ``update_one``.
+
+        On failure the changes stay staged for the next checkpoint.
+
+        Returns:
+            bool: True if nothing was left unwritten.
+        """
+        async with self._lock:
+            if not self._pending:
+                return True
+            if self.user is None:
+                logger.warning(f"No user found for call {self.call_sid}; dropping {reason} changes")
+                self._pending = {}
+                return False
+
+            fields, self._pending = self._pending, {}
+            update = {
+                key: value.value if isinstance(value, Enum) else value
+                for key, value in fields.items()
+            }
+            update["updatedAt"] = self.user.updatedAt = datetime.utcnow()
+            self.db_round_trips += 1
+            try:
+                await User.get_pymongo_collection().update_one(
+                    {"_id": self.user.id}, {"$set": update}
+                )
+            except Exception as e:
+                self._pending = {**fields, **self._pending}
+                logger.error(f"Call {self.call_sid} {reason} checkpoint failed: {e}")
+                return False
+
+            invalidate_user(self.call_sid, self.user.id)
+            call_feed.publish(self.call_sid, **fields)
+            logger.debug(f"Call {self.call_sid} {reason} checkpoint wrote {sorted(fields)}")
+            return True
+
+    async def record_event(self, source: CallEventSource, event: str, **data: Any) -> None:
+        """Append to the call's event log."""
+        self.db_round_trips += 1
+        await record_event(self.call_sid, source, event, **data)
@@ -0,0 +1,197 @@
+from datetime import datetime
+from typing import Any, Mapping, Optional
+
+from loguru import logger
+
+from models.user import User, CallStatus
+from service.cache import TTLCache
+from service.user_cache import invalidate_user
+
+# Order in which a call moves through Twilio's statuses. An event never
+# replaces a status with a higher rank, so a late "ringing" cannot overwrite
+# "completed". SCHEDULED is set by the bot mid-call and must survive the
+# call's own "completed" event.
+STATUS_RANK = {
+    CallStatus.PENDING.value: 0,
+    CallStatus.QUEUED.value: 1,
+    CallStatus.RINGING.value: 2,
+    CallStatus.IN_PROGRESS.value: 3,
+    CallStatus.CONNECTED.value: 3,
+    CallStatus.COMPLETED.value: 4,
+    CallStatus.BUSY.value: 4,
+    CallStatus.FAILED.value: 4,
+    CallStatus.NO_ANSWER.value: 4,
+    CallStatus.CANCELED.value: 4,
+    CallStatus.SCHEDULED.value: 5,
+}
+
+# call_sid -> (sequence number, status rank) of the last event applied here,
+# used to drop duplicate and stale events without touching the database.
+_last_applied = TTLCache(maxsize=10000, ttl=3600)
+
+
+class StatusUpdate:
+    """One status callback reduced to a guarded single-document update."""
+
+    def __init__(self, call_sid: str, sequence: Optional[int], fields: dict[str, Any]):
+        self.call_sid = call_sid
+        self.sequence = sequence
+        self.fields = fields
+
+    @property
+    def rank(self) -> int:
+        return STATUS_RANK.get(self.fields.get("status"), 0)
+
+    def _higher_statuses(self) -> list[str]:
+        return [status for status, rank in STATUS_RANK.items() if rank > self.rank]
+
+    def filter(self) -> dict:
+        """Match the call only if this event is newer than the last one applied
+        and would change at least one stored value.
+
+        A redelivered or no-op event therefore matches nothing and leaves the
+        document, its ``updatedAt`` and the caches untouched.
+        """
+        query: dict[str, Any] = {"call_sid": self.call_sid}
+        conditions: list[dict] = []
+        if self.sequence is not None:
+            conditions.append(
+                {
+                    "$or": [
+                        {"status_sequence": None},
+                        {"status_sequence": {"$lt": self.sequence}},
+                    ]
+                }
+            )
+        changes: list[dict] = [
+            {key: {"$ne": value}} for key, value in self.fields.items() if key != "status"
+        ]
+        if "status" in self.fields:
+            # Same rule as update(): a higher stored status is kept
+            changes.append(
+                {"status": {"$nin": self._higher_statuses() + [self.fields["status"]]}}
+            )
+        conditions.append({"$or": changes})
+        query["$and"] = conditions
+        return query
+
+    def update(self, now: Optional[datetime] = None) -> list[dict]:
+        """Pipeline update that never lowers the stored status.
+
+        The other fields (e.g. the final Duration) are still recorded when the
+        status is kept, such as the "completed" event of a call the bot has
+        already marked SCHEDULED. ``now`` is stored as ``updatedAt``, so a
+        batch can find the documents it changed.
+        """
+        fields: dict[str, Any] = {
+            key: {"$literal": value}
+            for key, value in self.fields.items()
+            if key != "status"
+        }
+        if "status" in self.fields:
+            fields["status"] = {
+                "$cond": [
+                    {"$in": ["$status", self._higher_statuses()]},
+                    "$status",
+                    {"$literal": self.fields["status"]},
+                ]
+            }
+        if self.sequence is not None:
+            fields["status_sequence"] = self.sequence
+        fields["updatedAt"] = now or datetime.utcnow()
+        return [{"$set": fields}]
+
+    def is_stale(self) -> bool:
+        """True if an equal or newer event for this call was already applied."""
+        last = _last_applied.get(self.call_sid)
+        if last is None:
+            return False
+        last_sequence, last_rank = last
+        if self.sequence is not None and last_sequence is not None:
+            return self.sequence <= last_sequence
+        return self.rank < last_rank
+
+    def mark_applied(self) -> None:
+        _last_applied.set(self.call_sid, (self.sequence, self.rank))
+
+    def is_newer_than(self, other: "StatusUpdate") -> bool:
+        if self.sequence is not None and other.sequence is not None:
+            return self.sequence > other.sequence
+        return self.rank >= other.rank
+
+    def merge(self, other: "StatusUpdate") -> "StatusUpdate":
+        """Combine two events for the same call into one update.
+
+        Fields from the newer event win, except ``status``, which follows the
+        same precedence as the database guard.
+        """
+        older, newer = (other, self) if self.is_newer_than(other) else (self, other)
+        fields = {**older.fields, **newer.fields}
+        highest = max(older, newer, key=lambda update: update.rank)
+        if "status" in highest.fields:
+            fields["status"] = highest.fields["status"]
+        sequences = [s for s in (older.sequence, newer.sequence) if s is not None]
+        return StatusUpdate(self.call_sid, max(sequences) if sequences else None, fields)
+
+
+def parse_status_callback(form: Mapping[str, Any]) -> Optional[StatusUpdate]:
+    """Turn Twilio status callback form data into a ``StatusUpdate``.
+
+    Only fields present in the callback are set. Returns None when there is
+    nothing to apply.
+    """
+    call_sid = form.get("CallSid")
+    if not call_sid:
+        return None
+
+    fields: dict[str, Any] = {}
+    if form.get("CallStatus"):
+        fields["status"] = form.get("CallStatus")
+
+    call_duration = form.get("CallDuration")
+    if call_duration:
+        try:
+            fields["Duration"] = int(call_duration)
+        except ValueError:
+            fields["Duration"] = 0
+
+    # Mapping based on request: CallerCountry mapped to CallerCountry (assuming typo in request asking for CallerCity)
+    for key in ("CallerCountry", "CallerZip", "FromCountry", "ToCountry"):
+        if form.get(key):
+            fields[key] = form.get(key)
+
+    if not fields:
+        return None
+
+    try:
+        sequence = int(form["SequenceNumber"]) if form.get("SequenceNumber") else None
+    except ValueError:
+        sequence = None
+
+    return StatusUpdate(call_sid, sequence, fields)
+
+
+async def apply_status_callback(form: Mapping[str, Any]) -> bool:
+    """Apply a Twilio status callback with a single guarded ``update_one``.
+
+    Returns:
+        bool: True if the stored call changed.
+    """
+    update = parse_status_callback(form)
+    if update is None:
+        return False
+    if update.is_stale():
+        logger.debug(f"Skipping stale status event for {update.call_sid}")
+        return False
+
+    result = await User.get_pymongo_collection().update_one(
+        update.filter(), update.update()
+    )
+    if result.modified_count:
+        update.mark_applied()
+        invalidate_user(update.call_sid)
+        logger.info(f"Updated call {update.call_sid} status to {update.fields.get('status')}")
+        return True
+
+    logger.info(f"No newer state applied for CallSid {update.call_sid}")
+    return False
@@ -0,0 +1,308 @@
+import asyncio
+import os
+import socket
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from loguru import logger
+from pymongo import UpdateOne
+
+from excel_utils import RejectedRow, iter_lead_chunks
+from models.campaign import Campaign, CampaignRow, CampaignRowStatus, CampaignStatus
+from models.user import User, CallStatus
+from server_utils import DialoutRequest
+from service.dialer import DialJob, DialOutEngine, DialResult
+from service.persistence import CallRecordBuffer
+
+# Strong references to running campaign tasks so they are not garbage collected.
+_running: set[asyncio.Task] = set()
+
+# Campaigns run in-process; the host and heartbeat let a restarted process
+# find the ones that died with the previous one.
+CAMPAIGN_HOST = socket.gethostname()
+CAMPAIGN_HEARTBEAT = float(os.getenv("CAMPAIGN_HEARTBEAT", "30"))
+
+
+async def start_campaign(
+    content: bytes,
+    filename: str | None,
+    from_number: str,
+    allow_redial: bool = False,
+) -> Campaign:
+    """Persist a new campaign and dial its rows in a background task.
+
+    Args:
+        content (bytes): The uploaded spreadsheet.
+        filename (str | None): Upload filename, used to detect CSV.
+        from_number (str): Twilio number to call from.
+        allow_redial (bool): Also dial numbers that already have a call record.
+
+    Returns:
+        Campaign: The created campaign; poll ``GET /campaigns/{id}`` for progress.
+    """
+    campaign = Campaign(filename=filename, host=CAMPAIGN_HOST)
+    await campaign.insert()
+
+    task = asyncio.create_task(
+        run_campaign(campaign, content, from_number, allow_redial)
+    )
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+    return campaign
+
+
+async def recover_interrupted_campaigns() -> int:
+    """Mark campaigns that lost their process as interrupted.
+
+    Run at startup. A pending or running campaign counts as lost if it was
+    started on this host (its task died with the previous process) or its
+    heartbeat is more than four intervals old. Rows it had not dialed stay
+    ``queued``.
+
+    Returns:
+        int: How many campaigns were marked.
+    """
+    now = datetime.utcnow()
+    result = await Campaign.get_pymongo_collection().update_many(
+        {
+            "status": {"$in": [CampaignStatus.PENDING.value, CampaignStatus.RUNNING.value]},
+            "$or": [
+                {"host": CAMPAIGN_HOST},
+                {"updatedAt": {"$lt": now - timedelta(seconds=CAMPAIGN_HEARTBEAT * 4)}},
+            ],
+        },
+        {
+            "$set": {
+                "status": CampaignStatus.INTERRUPTED.value,
+                "error": "Interrupted by a restart before it finished",
+                "finishedAt": now,
+                "updatedAt": now,
+            }
+        },
+    )
+    if result.modified_count:
+        logger.warning(f"Marked {result.modified_count} unfinished campaigns as interrupted")
+    return result.modified_count
+
+
+async def _heartbeat(campaign: Campaign) -> None:
+    while True:
+        await asyncio.sleep(CAMPAIGN_HEARTBEAT)
+        try:
+            await Campaign.get_pymongo_collection().update_one(
+                {"_id": campaign.id}, {"$set": {"updatedAt": datetime.utcnow()}}
+            )
+        except Exception as e:
+            logger.error(f"Campaign {campaign.id} heartbeat failed: {e}")
+
+
+async def _update_counters(campaign: Campaign, **inc: int) -> None:
+    await campaign.update(
+        {"$inc": inc, "$set": {"updatedAt": datetime.utcnow()}}
+    )
+
+
+async def _already_called(phones: list[str]) -> set[str]:
+    """Return which of ``phones`` already have a call record, in one indexed query."""
+    if not phones:
+        return set()
+    return set(
+        await User.get_pymongo_collection().distinct(
+            "phonenumber", {"phonenumber": {"$in": phones}}
+        )
+    )
+
+
+async def _ingest(campaign: Campaign, content: bytes, allow_redial: bool) -> None:
+    """Stream the sheet into ``CampaignRow`` documents, one insert per chunk.
+
+    Numbers are normalized and deduplicated within the file while parsing;
+    unless ``allow_redial`` is set, numbers that were already called are
+    skipped as well.
+    """
+    chunks = iter_lead_chunks(content, campaign.filename)
+    while True:
+        # Parsing is CPU bound; keep it off the event loop serving live calls.
+        chunk = await asyncio.to_thread(next, chunks, None)
+        if chunk is None:
+            break
+        rows, rejects = chunk
+
+        if not allow_redial:
+            called = await _already_called([row["phoneno"] for row in rows])
+            if called:
+                rejects = rejects + [
+                    RejectedRow(
+                        row_number=row["row_number"],
+                        reason="Number already called",
+                        data={k: v for k, v in row.items() if k != "row_number"},
+                    )
+                    for row in rows
+                    if row["phoneno"] in called
+                ]
+                rows = [row for row in rows if row["phoneno"] not in called]
+
+        documents = [
+            CampaignRow(
+                campaign_id=campaign.id,
+                row_number=reject.row_number,
+                name=reject.data.get("name"),
+                phoneno=reject.data.get("phoneno"),
+                email=reject.data.get("email"),
+                status=CampaignRowStatus.SKIPPED,
+                error=reject.reason,
+            )
+            for reject in rejects
+        ]
+        documents.extend(
+            CampaignRow(
+                campaign_id=campaign.id,
+                row_number=row["row_number"],
+                name=row.get("name"),
+                phoneno=row["phoneno"],
+                email=row.get("email"),
+            )
+            for row in rows
+        )
+        if documents:
+            await CampaignRow.insert_many(documents, ordered=False)
+        await _update_counters(
+            campaign,
+            total_rows=len(documents),
+            queued=len(rows),
+            skipped=len(rejects),
+            db_round_trips=(2 if documents else 1) + (0 if allow_redial else 1),
+        )
+
+
+async def _queued_jobs(campaign: Campaign, from_number: str):
+    async for row in CampaignRow.find(
+        CampaignRow.campaign_id == campaign.id,
+        CampaignRow.status == CampaignRowStatus.QUEUED,
+    ).sort("+row_number"):
+        yield DialJob(
+            request=DialoutRequest(to_number=row.phoneno, from_number=from_number),
+            context={"row_id": row.id, "name": row.name, "email": row.email},
+        )
+
+
+class CampaignRecorder:
+    """Buffers a campaign's dial results and persists them in batches.
+
+    Call records go through a ``CallRecordBuffer``, which writes them with one
+    unordered ``insert_many`` per batch. Row results and campaign counters
+    are flushed on the same batch size and interval: one ``bulk_write`` and
+    one ``$inc`` per flush, regardless of batch size.
+    """
+
+    def __init__(self, campaign: Campaign):
+        self.campaign = campaign
+        self.records = CallRecordBuffer()
+        self.row_updates: list[UpdateOne] = []
+        self.counters: Counter[str] = Counter()
+        self.round_trips = 0
+        self._reported_trips = 0
+        self._last_flush = time.monotonic()
+
+    @property
+    def db_round_trips(self) -> int:
+        return self.round_trips + self.records.round_trips
+
+    async def record(self, result: DialResult) -> None:
+        row_id = result.job.context["row_id"]
+        to_number = result.job.request.to_number
+
+        if result.ok:
+            call_sid = result.call_result.call_sid
+            user = self.records.build(
+                name=result.job.context.get("name") or "Unknown",
+                email=result.job.context.get("email"),
+                phonenumber=to_number,
+                call_sid=call_sid,
+                status=CallStatus.RINGING,
+            )
+            if user is not None:
+                await self.records.add(user)
+            update = {
+                "status": CampaignRowStatus.INITIATED.value,
+                "phoneno": to_number,
+                "call_sid": call_sid,
+            }
+            self.counters.update(queued=-1, initiated=1)
+        else:
+            update = {"status": CampaignRowStatus.FAILED.value, "error": result.error}
+            self.counters.update(queued=-1, failed=1)
+
+        self.row_updates.append(UpdateOne({"_id": row_id}, {"$set": update}))
+
+        if (
+            len(self.row_updates) >= self.records.batch_size
+            or time.monotonic() - self._last_flush >= self.records.flush_interval
+        ):
+            await self.flush()
+
+    async def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        await self.records.flush()
+        if not self.row_updates:
+            return
+
+        # Swap before awaiting so concurrent results go into the next batch.
+        updates, self.row_updates = self.row_updates, []
+        counters, self.counters = self.counters, Counter()
+
+        self.round_trips += 1
+        try:
+            await CampaignRow.get_pymongo_collection().bulk_write(updates, ordered=False)
+        except Exception as e:
+            logger.error(f"Failed to save {len(updates)} campaign row results: {e}")
+
+        self.round_trips += 1
+        # Includes the call record inserts made since the last flush
+        trips = self.db_round_trips - self._reported_trips
+        self._reported_trips = self.db_round_trips
+        await _update_counters(self.campaign, **counters, db_round_trips=trips)
+
+
+async def run_campaign(
+    campaign: Campaign, content: bytes, from_number: str, allow_redial: bool = False
+) -> None:
+    """Ingest the sheet, then dial every queued row through the dial-out engine."""
+    heartbeat = asyncio.create_task(_heartbeat(campaign))
+    try:
+        await campaign.set({Campaign.status: CampaignStatus.RUNNING})
+        await _ingest(campaign, content, allow_redial)
+
+        recorder = CampaignRecorder(campaign)
+        stats = await DialOutEngine().run(
+            _queued_jobs(campaign, from_number), on_result=recorder.record
+        )
+        await recorder.flush()
+
+        now = datetime.utcnow()
+        await campaign.set(
+            {
+                Campaign.status: CampaignStatus.COMPLETED,
+                Campaign.dials_per_second: round(stats.dials_per_second, 3),
+                Campaign.finishedAt: now,
+                Campaign.updatedAt: now,
+            }
+        )
+        logger.info(
+            f"Campaign {campaign.id} finished: {stats.summary()}, "
+            f"{recorder.db_round_trips} DB round trips for call results"
+        )
+    except Exception as e:
+        logger.exception(f"Campaign {campaign.id} failed")
+        now = datetime.utcnow()
+        await campaign.set(
+            {
+                Campaign.status: CampaignStatus.FAILED,
+                Campaign.error: str(e),
+                Campaign.finishedAt: now,
+                Campaign.updatedAt: now,
+            }
+        )
+    finally:
+        heartbeat.cancel()
@@ -0,0 +1,218 @@
+import asyncio
+import os
+import random
+import time
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable, Optional
+
+from loguru import logger
+from pydantic import BaseModel
+from twilio.base.exceptions import TwilioRestException
+
+from server_utils import DialoutRequest, TwilioCallResult, make_twilio_call
+
+
+# Twilio answers with HTTP 429 / error code 20429 when the account's
+# calls-per-second (CPS) limit is exceeded.
+TWILIO_RATE_LIMIT_CODE = 20429
+
+
+class DialJob(BaseModel):
+    """A single call to place, plus whatever context the caller wants back.
+
+    Attributes:
+        request (DialoutRequest): The numbers to dial.
+        context (dict): Opaque data (e.g. the spreadsheet row) echoed in the result.
+    """
+
+    request: DialoutRequest
+    context: dict[str, Any] = {}
+
+
+class DialResult(BaseModel):
+    """Outcome of a dial job.
+
+    Attributes:
+        job (DialJob): The job that was dialed.
+        call_result (TwilioCallResult | None): Twilio result when the call was created.
+        error (str | None): Error message when the call could not be created.
+        attempts (int): Number of Twilio requests made, including retries.
+    """
+
+    job: DialJob
+    call_result: Optional[TwilioCallResult] = None
+    error: Optional[str] = None
+    attempts: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.call_result is not None
+
+
+class DialStats(BaseModel):
+    """Throughput counters for one engine run."""
+
+    initiated: int = 0
+    failed: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def dials_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return (self.initiated + self.failed) / self.elapsed_seconds
+
+    def summary(self) -> dict[str, Any]:
+        data = self.model_dump()
+        data["dials_per_second"] = round(self.dials_per_second, 3)
+        return data
+
+
+class TokenBucket:
+    """Async token bucket limiting how many operations start per second."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self) -> None:
+        # Holding the lock while sleeping keeps waiters in FIFO order.
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+def is_rate_limited(exc: Exception) -> bool:
+    """Return True if a Twilio error means we exceeded the CPS limit."""
+    return isinstance(exc, TwilioRestException) and (
+        exc.status == 429 or exc.code == TWILIO_RATE_LIMIT_CODE
+    )
+
+
+class DialOutEngine:
+    """Places calls concurrently while respecting Twilio's CPS limit.
+
+    At most ``max_concurrency`` Twilio requests are in flight at once and new
+    requests start no faster than ``calls_per_second``. Rate-limited requests
+    (429 / 20429) are retried with exponential backoff and jitter.
+
+    Args:
+        dial: Coroutine placing one call; defaults to ``make_twilio_call``. Pass a
+            fake to benchmark the engine without hitting Twilio.
+        max_concurrency (int): Maximum number of in-flight dial requests.
+        calls_per_second (float): Token bucket rate, i.e. the account CPS.
+        max_retries (int): Retries per job after a rate-limit response.
+        base_backoff (float): First backoff delay in seconds, doubled per retry.
+    """
+
+    def __init__(
+        self,
+        dial: Callable[[DialoutRequest], Awaitable[TwilioCallResult]] = make_twilio_call,
+        max_concurrency: Optional[int] = None,
+        calls_per_second: Optional[float] = None,
+        max_retries: int = 5,
+        base_backoff: float = 0.5,
+    ):
+        self.dial = dial
+        self.max_concurrency = max_concurrency or int(
+            os.getenv("DIAL_MAX_CONCURRENCY", "10")
+        )
+        self.calls_per_second = calls_per_second or float(
+            os.getenv("TWILIO_CPS", "1")
+        )
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.bucket = TokenBucket(self.calls_per_second)
+
+    async def _dial_with_retry(self, job: DialJob, stats: DialStats) -> DialResult:
+        result = DialResult(job=job)
+        while True:
+            await self.bucket.acquire()
+            result.attempts += 1
+            try:
+                result.call_result = await self.dial(job.request)
+                stats.initiated += 1
+                return result
+            except Exception as e:
+                if is_rate_limited(e) and result.attempts <= self.max_retries:
+                    stats.rate_limited += 1
+                    stats.retries += 1
+                    delay = self.base_backoff * 2 ** (result.attempts - 1)
+                    delay += random.uniform(0, self.base_backoff)
+                    logger.warning(
+                        f"Twilio rate limit for {job.request.to_number}, retrying in {delay:.2f}s"
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                logger.error(f"Failed to initiate call to {job.request.to_number}: {e}")
+                result.error = str(e)
+                stats.failed += 1
+                return result
+
+    async def run(
+        self,
+        jobs: Iterable[DialJob] | AsyncIterable[DialJob],
+        on_result: Optional[Callable[[DialResult], Awaitable[None]]] = None,
+    ) -> DialStats:
+        """Dial every job and return throughput statistics.
+
+        Args:
+            jobs: Jobs to dial; may be a (possibly lazy) sync or async iterable.
+            on_result: Optional coroutine invoked with each ``DialResult`` as soon
+                as it is available, e.g. to persist the call record.
+
+        Returns:
+            DialStats: Counters and elapsed time for the run.
+        """
+        stats = DialStats()
+        queue: asyncio.Queue[Optional[DialJob]] = asyncio.Queue(
+            maxsize=self.max_concurrency * 2
+        )
+
+        async def worker():
+            while True:
+                job = await queue.get()
+                if job is None:
+                    return
+                result = await self._dial_with_retry(job, stats)
+                if on_result:
+                    try:
+                        await on_result(result)
+                    except Exception as e:
+                        logger.error(f"Dial result handler failed: {e}")
+
+        started = time.monotonic()
+        workers = [asyncio.create_task(worker()) for _ in range(self.max_concurrency)]
+        try:
+            if hasattr(jobs, "__aiter__"):
+                async for job in jobs:
+                    await queue.put(job)
+            else:
+                for job in jobs:
+                    await queue.put(job)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            stats.elapsed_seconds = time.monotonic() - started
+
+        logger.info(f"Dial-out run finished: {stats.summary()}")
+        return stats
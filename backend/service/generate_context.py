@@ -66,8 +66,14 @@ class AnalystResult(BaseModel):
     outcome: str
 
 
-async def analyze_transcript(transcript: str) -> AnalystResult:
-    """Analyze transcript"""
+async def analyze_transcript(transcript: str, raise_errors: bool = False) -> AnalystResult:
+    """Analyze transcript
+
+    Args:
+        transcript (str): The call transcript.
+        raise_errors (bool): Raise instead of returning the "Analysis failed"
+            default, so the caller can retry.
+    """
     try:
         # Log input transcript
         logger.info(f"📝 Analyzing transcript (length: {len(transcript)} characters)")
@@ -102,6 +108,8 @@ async def analyze_transcript(transcript: str) -> AnalystResult:
 
     except Exception as e:
         logger.error(f"❌ Error analyzing transcript: {e}")
+        if raise_errors:
+            raise
         # Return a default result if analysis fails
         default_result = AnalystResult(
             summary="Analysis failed",
@@ -0,0 +1,112 @@
+import asyncio
+import os
+from typing import Any, Optional
+
+from beanie import PydanticObjectId
+from loguru import logger
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from models.user import User
+from service.call_context import call_context
+from service.call_feed import call_feed
+
+
+class CallRecordBuffer:
+    """Buffers ``User`` call records and writes them with unordered ``insert_many``.
+
+    A batch is written as soon as it holds ``batch_size`` records, and a
+    partial batch at most ``flush_interval`` seconds after its first record.
+    Records get their ``_id`` when built and are handed to ``call_context``
+    on ``add``, so /twiml and the bot never wait for the insert. Status
+    callbacks that arrive first are retried by the status write-behind
+    buffer until the record exists.
+
+    Each record is validated on its own, so one bad row (e.g. an invalid email)
+    never sinks the batch: an invalid email is dropped and the record kept, any
+    other validation error skips only that record. Because the insert is
+    unordered, a write error on one document does not stop the others.
+
+    Args:
+        batch_size (int): Records per ``insert_many``; defaults to
+            ``CALL_RECORD_BATCH_SIZE`` or 100.
+        flush_interval (float): Longest time, in seconds, a record waits
+            before being written; defaults to ``CALL_RECORD_FLUSH_INTERVAL`` or 2.
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        self.batch_size = batch_size or int(os.getenv("CALL_RECORD_BATCH_SIZE", "100"))
+        self.flush_interval = (
+            flush_interval
+            if flush_interval is not None
+            else float(os.getenv("CALL_RECORD_FLUSH_INTERVAL", "2"))
+        )
+        self.pending: list[User] = []
+        self.round_trips = 0
+        self.inserted = 0
+        self.failed = 0
+        self._timer: Optional[asyncio.Task] = None
+
+    def build(self, **fields: Any) -> Optional[User]:
+        """Validate one call record, returning None if it cannot be stored."""
+        try:
+            return User(id=PydanticObjectId(), **fields)
+        except ValidationError as e:
+            if fields.get("email") and any(err["loc"] == ("email",) for err in e.errors()):
+                logger.warning(
+                    f"Dropping invalid email {fields['email']!r} for call {fields.get('call_sid')}"
+                )
+                return self.build(**{**fields, "email": None})
+            logger.error(f"Invalid call record for {fields.get('call_sid')}: {e}")
+            self.failed += 1
+            return None
+
+    async def add(self, user: User) -> None:
+        """Buffer a built record, writing the batch when it is full."""
+        self.pending.append(user)
+        call_context.put(user)
+        if len(self.pending) >= self.batch_size:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """Write all buffered records in one round trip; returns how many were stored."""
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+            self._timer = None
+        if not self.pending:
+            return 0
+
+        # Swap before awaiting so concurrent callers go into the next batch.
+        batch, self.pending = self.pending, []
+        self.round_trips += 1
+        try:
+            result = await User.insert_many(batch, ordered=False)
+            stored = len(result.inserted_ids)
+            for user in batch:
+                call_feed.publish_insert(user)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            for error in errors:
+                logger.error(
+                    f"Failed to save call {batch[error['index']].call_sid}: {error.get('errmsg')}"
+                )
+            stored = e.details.get("nInserted", len(batch) - len(errors))
+        except Exception as e:
+            logger.error(f"Failed to save {len(batch)} call records: {e}")
+            stored = 0
+
+        self.inserted += stored
+        self.failed += len(batch) - stored
+        logger.info(f"Saved {stored}/{len(batch)} call records to DB")
+        return stored
@@ -0,0 +1,59 @@
+import os
+from functools import lru_cache
+from typing import Optional
+
+import pandas as pd
+
+# Country calling code assumed for numbers written without one.
+DEFAULT_COUNTRY_CODE = os.getenv("DEFAULT_COUNTRY_CODE", "91")
+
+# National significant number length for the default country (10 for India).
+NATIONAL_NUMBER_LENGTH = int(os.getenv("NATIONAL_NUMBER_LENGTH", "10"))
+
+E164_PATTERN = r"^\+[1-9]\d{7,14}$"
+
+
+def normalize_phone_column(phones: pd.Series) -> pd.Series:
+    """Convert a column of phone numbers to E.164 in one vectorized pass.
+
+    Handles the usual spreadsheet shapes: floats with a trailing ``.0``,
+    spaces/dashes/parentheses, an international ``00`` prefix, a national
+    trunk ``0`` prefix, and numbers with or without the default country code.
+    Values that cannot be turned into a valid E.164 number become ``<NA>``.
+
+    Args:
+        phones (pd.Series): Raw phone values.
+
+    Returns:
+        pd.Series: String series of E.164 numbers, ``<NA>`` where invalid.
+    """
+    raw = phones.astype("string").str.strip()
+    raw = raw.str.replace(r"\.0$", "", regex=True)
+    has_plus = raw.str.startswith("+").fillna(False)
+    digits = raw.str.replace(r"\D", "", regex=True)
+
+    has_idd = ~has_plus & digits.str.startswith("00").fillna(False)
+    digits = digits.mask(has_idd, digits.str.slice(2))
+    international = has_plus | has_idd
+
+    national = ~international
+    has_trunk = (
+        national
+        & digits.str.startswith("0").fillna(False)
+        & (digits.str.len() == NATIONAL_NUMBER_LENGTH + 1)
+    )
+    digits = digits.mask(has_trunk, digits.str.slice(1))
+    add_country_code = national & (digits.str.len() == NATIONAL_NUMBER_LENGTH)
+
+    e164 = "+" + digits.mask(add_country_code, DEFAULT_COUNTRY_CODE + digits)
+    return e164.where(e164.str.match(E164_PATTERN).fillna(False)).astype("string")
+
+
+@lru_cache(maxsize=4096)
+def normalize_phone(phone: str) -> Optional[str]:
+    """Normalize a single phone number to E.164, or None if invalid.
+
+    Results are cached, so repeated lookups of the same number are free.
+    """
+    value = normalize_phone_column(pd.Series([phone], dtype="string")).iloc[0]
+    return None if pd.isna(value) else value
@@ -0,0 +1,428 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from loguru import logger
+from pymongo import ReturnDocument
+
+from models.call_event import CallEventSource
+from models.post_call_job import PostCallJob, PostCallJobKind, PostCallJobStatus
+from service.call_session import CallSession
+
+JobHandler = Callable[[PostCallJob], Awaitable[None]]
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying the job cannot succeed."""
+
+
+class PostCallQueue:
+    """Runs post-call work (transcript analysis, recording upload) off the call path.
+
+    Jobs are written to the ``post_call_job`` collection before anything
+    runs, so work survives a restart. A fixed pool of workers claims due jobs
+    with ``find_one_and_update`` and holds each under a lease, renewed every
+    third of the lease while the job runs; a job whose lease runs out,
+    because its worker died, is claimed again. Results are only recorded by
+    the worker still holding the lease. A failed job is
+    retried with exponential backoff until ``max_attempts``, then marked
+    failed; a ``PermanentJobError`` fails it straight away. Attempts are
+    counted when a job is claimed, so a job whose worker keeps dying is
+    failed once its last lease runs out instead of being claimed forever.
+    Handlers save progress with ``save_progress`` so a retry can skip steps
+    that already succeeded.
+
+    Jobs enqueued with ``local=True`` depend on this host's filesystem and
+    are only claimed by workers on the same ``host``.
+
+    Args:
+        workers (int): Jobs run at once; defaults to ``POST_CALL_WORKERS`` or 4.
+        max_attempts (int): Attempts before a job is given up; defaults to
+            ``POST_CALL_MAX_ATTEMPTS`` or 5.
+        retry_base (float): Seconds before the first retry, doubled for each
+            later one; defaults to ``POST_CALL_RETRY_BASE`` or 5.
+        retry_max (float): Longest retry delay in seconds; defaults to
+            ``POST_CALL_RETRY_MAX`` or 300.
+        lease (float): Seconds a claimed job stays with its worker; defaults
+            to ``POST_CALL_LEASE`` or 300.
+        poll_interval (float): Seconds idle workers wait before looking for
+            due retries; defaults to ``POST_CALL_POLL_INTERVAL`` or 5.
+        host (str): Name local jobs are pinned to; defaults to
+            ``POST_CALL_HOST`` or the hostname. Set it to a stable value when
+            the recordings directory outlives the container.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        retry_base: Optional[float] = None,
+        retry_max: Optional[float] = None,
+        lease: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+        host: Optional[str] = None,
+    ):
+        self.workers = workers or int(os.getenv("POST_CALL_WORKERS", "4"))
+        self.max_attempts = max_attempts or int(os.getenv("POST_CALL_MAX_ATTEMPTS", "5"))
+        self.retry_base = retry_base or float(os.getenv("POST_CALL_RETRY_BASE", "5"))
+        self.retry_max = retry_max or float(os.getenv("POST_CALL_RETRY_MAX", "300"))
+        self.lease = lease or float(os.getenv("POST_CALL_LEASE", "300"))
+        self.poll_interval = poll_interval or float(os.getenv("POST_CALL_POLL_INTERVAL", "5"))
+        self.host = host or os.getenv("POST_CALL_HOST") or socket.gethostname()
+        self._handlers: dict[PostCallJobKind, JobHandler] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self.busy = 0
+        self.backlog = 0
+        self.oldest_due_s: Optional[float] = None
+        self.enqueued = 0
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+        self._latency_ms: deque[float] = deque(maxlen=1000)
+        self._run_ms: deque[float] = deque(maxlen=1000)
+
+    def register(self, kind: PostCallJobKind, handler: JobHandler) -> None:
+        self._handlers[kind] = handler
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+            self._tasks.append(asyncio.create_task(self._monitor()))
+            logger.info(f"Post-call queue started with {self.workers} workers")
+
+    async def stop(self) -> None:
+        """Stop the workers; jobs they were running go back to pending."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def enqueue(
+        self, kind: PostCallJobKind, call_sid: str, local: bool = False, **payload: Any
+    ) -> Optional[PostCallJob]:
+        """Store a job and wake a worker; returns None if it could not be stored.
+
+        Pass ``local=True`` when the job reads files on this host, so only
+        this host's workers claim it.
+        """
+        job = PostCallJob(
+            kind=kind,
+            call_sid=call_sid,
+            payload=payload,
+            host=self.host if local else None,
+        )
+        try:
+            await job.insert()
+        except Exception as e:
+            logger.error(f"Could not queue {kind.value} job for call {call_sid}: {e}")
+            return None
+        self.enqueued += 1
+        self._wakeup.set()
+        return job
+
+    def _backoff(self, attempts: int) -> float:
+        return min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+
+    async def _claim(self) -> Optional[PostCallJob]:
+        """Atomically take the oldest due job, or one whose worker's lease ran out.
+
+        Only jobs that are not pinned to a host, or are pinned to this one,
+        are considered.
+        """
+        now = datetime.utcnow()
+        host = {"$in": [None, self.host]}
+        attempts = {"$lt": self.max_attempts}
+        doc = await PostCallJob.get_pymongo_collection().find_one_and_update(
+            {
+                "$or": [
+                    {
+                        "status": PostCallJobStatus.PENDING.value,
+                        "host": host,
+                        "attempts": attempts,
+                        "run_after": {"$lte": now},
+                    },
+                    {
+                        "status": PostCallJobStatus.RUNNING.value,
+                        "host": host,
+                        "attempts": attempts,
+                        "locked_until": {"$lt": now},
+                    },
+                ]
+            },
+            {
+                "$set": {
+                    "status": PostCallJobStatus.RUNNING.value,
+                    "locked_until": now + timedelta(seconds=self.lease),
+                    "lease_owner": uuid.uuid4().hex,
+                    "updatedAt": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("run_after", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        return PostCallJob.model_validate(doc) if doc else None
+
+    async def _fail_exhausted(self) -> int:
+        """Fail jobs whose worker died during their last attempt."""
+        now = datetime.utcnow()
+        result = await PostCallJob.get_pymongo_collection().update_many(
+            {
+                "status": PostCallJobStatus.RUNNING.value,
+                "attempts": {"$gte": self.max_attempts},
+                "locked_until": {"$lt": now},
+            },
+            {
+                "$set": {
+                    "status": PostCallJobStatus.FAILED.value,
+                    "finishedAt": now,
+                    "updatedAt": now,
+                    "error": f"Worker lost on each of {self.max_attempts} attempts",
+                }
+            },
+        )
+        if result.modified_count:
+            self.failed += result.modified_count
+            logger.error(
+                f"Failed {result.modified_count} post-call jobs whose worker died "
+                f"on their last attempt"
+            )
+        return result.modified_count
+
+    def _leased(self, job: PostCallJob) -> dict[str, Any]:
+        return {
+            "_id": job.id,
+            "status": PostCallJobStatus.RUNNING.value,
+            "lease_owner": job.lease_owner,
+        }
+
+    async def _renew(self, job: PostCallJob) -> None:
+        """Extend the job's lease until cancelled or until it is lost."""
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                result = await PostCallJob.get_pymongo_collection().update_one(
+                    self._leased(job),
+                    {"$set": {"locked_until": datetime.utcnow() + timedelta(seconds=self.lease)}},
+                )
+            except Exception as e:
+                logger.error(f"Could not renew the lease on post-call job {job.id}: {e}")
+                continue
+            if not result.matched_count:
+                logger.warning(f"Post-call job {job.id} lost its lease while running")
+                return
+
+    async def save_progress(self, job: PostCallJob, **payload: Any) -> None:
+        """Store values in the job's payload so a retry can pick up from them.
+
+        Raises:
+            RuntimeError: If the job's lease was lost to another worker.
+        """
+        result = await PostCallJob.get_pymongo_collection().update_one(
+            self._leased(job),
+            {"$set": {f"payload.{key}": value for key, value in payload.items()}},
+        )
+        if not result.matched_count:
+            raise RuntimeError(f"Post-call job {job.id} lost its lease")
+        job.payload.update(payload)
+
+    async def _finish(self, job: PostCallJob, **fields: Any) -> None:
+        fields["updatedAt"] = datetime.utcnow()
+        result = await PostCallJob.get_pymongo_collection().update_one(
+            self._leased(job), {"$set": fields}
+        )
+        if not result.matched_count:
+            logger.warning(
+                f"Post-call job {job.id} was claimed by another worker; "
+                f"not recording {fields.get('status')}"
+            )
+
+    async def _run(self, job: PostCallJob) -> None:
+        handler = self._handlers.get(job.kind)
+        started = time.perf_counter()
+        renewer = asyncio.create_task(self._renew(job))
+        try:
+            try:
+                if handler is None:
+                    raise RuntimeError(f"No handler for {job.kind.value} jobs")
+                await handler(job)
+            finally:
+                renewer.cancel()
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back without using up an attempt
+            await self._finish(
+                job,
+                status=PostCallJobStatus.PENDING.value,
+                attempts=job.attempts - 1,
+                locked_until=None,
+            )
+            raise
+        except Exception as e:
+            if job.attempts < self.max_attempts and not isinstance(e, PermanentJobError):
+                delay = self._backoff(job.attempts)
+                self.retried += 1
+                logger.warning(
+                    f"{job.kind.value} job for call {job.call_sid} failed "
+                    f"(attempt {job.attempts}), retrying in {delay:.0f}s: {e}"
+                )
+                await self._finish(
+                    job,
+                    status=PostCallJobStatus.PENDING.value,
+                    run_after=datetime.utcnow() + timedelta(seconds=delay),
+                    locked_until=None,
+                    error=str(e),
+                )
+            else:
+                self.failed += 1
+                logger.error(
+                    f"{job.kind.value} job for call {job.call_sid} failed after "
+                    f"{job.attempts} attempts: {e}"
+                )
+                await self._finish(
+                    job,
+                    status=PostCallJobStatus.FAILED.value,
+                    finishedAt=datetime.utcnow(),
+                    error=str(e),
+                )
+            return
+
+        finished = datetime.utcnow()
+        self.completed += 1
+        self._run_ms.append((time.perf_counter() - started) * 1000)
+        self._latency_ms.append((finished - job.createdAt).total_seconds() * 1000)
+        await self._finish(
+            job, status=PostCallJobStatus.DONE.value, finishedAt=finished, error=None
+        )
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                job = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Post-call queue could not claim a job: {e}")
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self.busy += 1
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Post-call job {job.id} could not be updated: {e}")
+            finally:
+                self.busy -= 1
+
+    async def _monitor(self) -> None:
+        """Keep the backlog figures in ``stats`` current and fail exhausted jobs."""
+        collection = PostCallJob.get_pymongo_collection()
+        unfinished = {
+            "status": {"$in": [PostCallJobStatus.PENDING.value, PostCallJobStatus.RUNNING.value]}
+        }
+        while True:
+            try:
+                await self._fail_exhausted()
+                self.backlog = await collection.count_documents(unfinished)
+                oldest = await collection.find_one(
+                    {"status": PostCallJobStatus.PENDING.value}, sort=[("run_after", 1)]
+                )
+                self.oldest_due_s = (
+                    max((datetime.utcnow() - oldest["run_after"]).total_seconds(), 0.0)
+                    if oldest
+                    else None
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Post-call queue backlog check failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def stats(self) -> dict[str, Any]:
+        def percentile(values: deque, pct: float) -> Optional[float]:
+            ordered = sorted(values)
+            return round(ordered[int(len(ordered) * pct)], 1) if ordered else None
+
+        return {
+            "workers": self.workers,
+            "busy": self.busy,
+            "backlog": self.backlog,
+            "oldest_due_s": round(self.oldest_due_s, 1) if self.oldest_due_s is not None else None,
+            "enqueued": self.enqueued,
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed,
+            "latency_ms_p50": percentile(self._latency_ms, 0.5),
+            "latency_ms_p95": percentile(self._latency_ms, 0.95),
+            "run_ms_p50": percentile(self._run_ms, 0.5),
+        }
+
+
+async def analyse_call(job: PostCallJob) -> None:
+    """Analyse the call's transcript and save the result on the call."""
+    from service.generate_context import analyze_transcript
+
+    analyst_result = await analyze_transcript(job.payload.get("transcript", ""), raise_errors=True)
+    session = CallSession(job.call_sid)
+    if not await session.load():
+        logger.warning(f"User not found for call {job.call_sid} to save analysis")
+        return
+    session.set(
+        Transcript=job.payload.get("transcript", ""),
+        Analysis=analyst_result.summary,
+        # Cast float score to int to match model definition
+        Quality_Score=int(analyst_result.quality_score),
+        Intent=analyst_result.intent,
+        Outcome=analyst_result.outcome,
+    )
+    if not await session.checkpoint("analysis"):
+        raise RuntimeError("Saving the analysis failed")
+    await session.record_event(
+        CallEventSource.ANALYSIS,
+        "analysis_saved",
+        quality_score=session.user.Quality_Score,
+        intent=session.user.Intent,
+        outcome=session.user.Outcome,
+    )
+    logger.info(f"Saved analysis for call {job.call_sid}: Score {session.user.Quality_Score}")
+
+
+async def upload_recording(job: PostCallJob) -> None:
+    """Upload the call's recording and save its URL on the call.
+
+    The URL is kept on the job once uploaded, so a retry after a failed save
+    does not upload the file again.
+    """
+    from service.bot import upload_file_to_cloud
+
+    path = job.payload["path"]
+    url = job.payload.get("url")
+    if url is None and not os.path.exists(path):
+        # Gone with the container or volume; no retry will bring it back
+        raise PermanentJobError(f"Recording file {path} not found on {job.host}")
+
+    async def remember(secure_url: str) -> None:
+        await post_call_queue.save_progress(job, url=secure_url)
+
+    await upload_file_to_cloud(
+        path, CallSession(job.call_sid), uploaded_url=url, on_uploaded=remember
+    )
+
+
+post_call_queue = PostCallQueue()
+post_call_queue.register(PostCallJobKind.ANALYSIS, analyse_call)
+post_call_queue.register(PostCallJobKind.RECORDING, upload_recording)
@@ -0,0 +1,78 @@
+from datetime import datetime
+from typing import Any, Optional
+
+from beanie import PydanticObjectId
+from loguru import logger
+
+from models.campaign import CampaignRow
+from models.user import User, CallStatus
+
+
+def _hot_queries() -> list[tuple[str, Any, dict, Optional[list]]]:
+    """The queries on the call path, as (name, model, filter, sort)."""
+    return [
+        ("call by call_sid", User, {"call_sid": "CA00000000000000000000000000000000"}, None),
+        ("call list", User, {}, [("createdAt", -1), ("_id", -1)]),
+        (
+            "due callbacks",
+            User,
+            {"status": CallStatus.SCHEDULED.value, "time_to_call": {"$lte": datetime.utcnow()}},
+            [("time_to_call", 1)],
+        ),
+        ("lead dedupe", User, {"phonenumber": {"$in": ["+910000000000"]}}, None),
+        (
+            "calls changed since",
+            User,
+            {"updatedAt": {"$gt": datetime.utcnow()}},
+            [("updatedAt", 1), ("_id", 1)],
+        ),
+        (
+            "queued campaign rows",
+            CampaignRow,
+            {"campaign_id": PydanticObjectId(), "status": "queued"},
+            [("row_number", 1)],
+        ),
+    ]
+
+
+def _find_stages(plan: Any) -> set[str]:
+    """Collect every ``stage`` name in an explain plan tree."""
+    stages: set[str] = set()
+    if isinstance(plan, dict):
+        if isinstance(plan.get("stage"), str):
+            stages.add(plan["stage"])
+        for value in plan.values():
+            stages |= _find_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            stages |= _find_stages(item)
+    return stages
+
+
+async def audit_query_plans() -> dict[str, set[str]]:
+    """Run ``explain()`` on each hot query and warn on collection scans.
+
+    Returns:
+        dict[str, set[str]]: Winning plan stages per query name.
+    """
+    results = {}
+    for name, model, query, sort in _hot_queries():
+        try:
+            cursor = model.get_pymongo_collection().find(query).limit(1)
+            if sort:
+                cursor = cursor.sort(sort)
+            explain = await cursor.explain()
+        except Exception as e:
+            logger.warning(f"Could not explain query '{name}': {e}")
+            continue
+
+        stages = _find_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+        results[name] = stages
+        if "COLLSCAN" in stages:
+            logger.warning(
+                f"Query '{name}' on {model.get_settings().name} uses a collection scan: "
+                f"filter={query} sort={sort}"
+            )
+        else:
+            logger.debug(f"Query '{name}' plan: {sorted(stages)}")
+    return results
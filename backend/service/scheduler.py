@@ -0,0 +1,189 @@
+import asyncio
+import heapq
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from beanie import PydanticObjectId
+from loguru import logger
+from pymongo import ReturnDocument
+
+from models.user import User, CallStatus
+from service.call_context import call_context
+from service.call_feed import call_feed
+from service.phone import normalize_phone
+from service.user_cache import invalidate_user
+from server_utils import DialoutRequest, get_twilio_config, make_twilio_call
+
+
+class CallbackDispatcher:
+    """Dials callbacks saved by the bot's ``schedule_callback`` function.
+
+    Upcoming ``time_to_call`` values are kept in an in-memory min-heap that is
+    refilled from an indexed ``(status, time_to_call)`` query. The dispatcher
+    sleeps until the earliest one is due (or until woken by ``notify``), then
+    claims it atomically with ``find_one_and_update`` so that several replicas
+    never dial the same callback. Overdue callbacks, e.g. after downtime, are
+    picked up by the first refill.
+
+    Args:
+        refill_interval (float): Seconds between heap refills from MongoDB.
+        horizon (float): How far ahead, in seconds, each refill looks.
+        batch_size (int): Maximum callbacks loaded per refill.
+        retry_delay (float): Seconds to push a callback back when dialing fails.
+    """
+
+    def __init__(
+        self,
+        refill_interval: Optional[float] = None,
+        horizon: Optional[float] = None,
+        batch_size: int = 500,
+        retry_delay: float = 300,
+    ):
+        self.refill_interval = refill_interval or float(
+            os.getenv("CALLBACK_REFILL_INTERVAL", "30")
+        )
+        self.horizon = horizon or float(os.getenv("CALLBACK_HORIZON", "300"))
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self._heap: list[tuple[datetime, PydanticObjectId]] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(self) -> None:
+        """Wake the dispatcher so it picks up a newly scheduled callback."""
+        self._wakeup.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Callback dispatcher started")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def refill(self) -> None:
+        """Reload the heap with every scheduled callback due within the horizon."""
+        until = datetime.utcnow() + timedelta(seconds=self.horizon)
+        cursor = (
+            User.get_pymongo_collection()
+            .find(
+                {"status": CallStatus.SCHEDULED.value, "time_to_call": {"$lte": until}},
+                {"time_to_call": 1},
+            )
+            .sort("time_to_call", 1)
+            .limit(self.batch_size)
+        )
+        heap = [(doc["time_to_call"].replace(tzinfo=None), doc["_id"]) async for doc in cursor]
+        heapq.heapify(heap)
+        self._heap = heap
+
+    async def _claim(self, user_id: PydanticObjectId) -> Optional[dict]:
+        """Atomically take ownership of a due callback; None if someone else did."""
+        now = datetime.utcnow()
+        return await User.get_pymongo_collection().find_one_and_update(
+            {
+                "_id": user_id,
+                "status": CallStatus.SCHEDULED.value,
+                "time_to_call": {"$lte": now},
+            },
+            {
+                "$set": {
+                    "status": CallStatus.COMPLETED.value,
+                    "time_to_call": None,
+                    "updatedAt": now,
+                }
+            },
+            return_document=ReturnDocument.BEFORE,
+        )
+
+    async def dispatch(self, user_id: PydanticObjectId) -> None:
+        """Claim one due callback and dial it."""
+        original = await self._claim(user_id)
+        if original is None:
+            return
+        invalidate_user(user_id=user_id)
+
+        # Records from before E.164 ingestion may hold raw sheet values
+        to_number = normalize_phone(original.get("phonenumber") or "")
+        if to_number is None:
+            logger.error(
+                f"Dropping callback for {original.get('name')}: "
+                f"invalid phone number {original.get('phonenumber')!r}"
+            )
+            return
+
+        try:
+            logger.info(f"Initiating callback for {original.get('name')}")
+            dialout_req = DialoutRequest(
+                to_number=to_number,
+                from_number=get_twilio_config().from_number,
+            )
+            call_result = await make_twilio_call(dialout_req)
+
+            # Create NEW user record for this call
+            new_user = User(
+                name=original.get("name"),
+                email=original.get("email"),
+                phonenumber=to_number,
+                call_sid=call_result.call_sid,
+                status=CallStatus.RINGING,
+            )
+            await new_user.insert()
+            call_feed.publish_insert(new_user)
+            call_context.put(new_user)
+            logger.info(f"Callback initiated for {original.get('name')}")
+        except Exception as e:
+            logger.error(f"Failed to callback {original.get('name')}: {e}")
+            # Put it back so it is retried later instead of being lost
+            await User.get_pymongo_collection().update_one(
+                {"_id": user_id},
+                {
+                    "$set": {
+                        "status": CallStatus.SCHEDULED.value,
+                        "time_to_call": datetime.utcnow()
+                        + timedelta(seconds=self.retry_delay),
+                        "updatedAt": datetime.utcnow(),
+                    }
+                },
+            )
+            invalidate_user(user_id=user_id)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_refill = 0.0
+        while True:
+            try:
+                if loop.time() >= next_refill or self._wakeup.is_set():
+                    self._wakeup.clear()
+                    await self.refill()
+                    next_refill = loop.time() + self.refill_interval
+
+                now = datetime.utcnow()
+                while self._heap and self._heap[0][0] <= now:
+                    _, user_id = heapq.heappop(self._heap)
+                    await self.dispatch(user_id)
+                    now = datetime.utcnow()
+
+                timeout = next_refill - loop.time()
+                if self._heap:
+                    due_in = (self._heap[0][0] - now).total_seconds()
+                    timeout = min(timeout, due_in)
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), max(timeout, 0))
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in callback dispatcher: {e}")
+                await asyncio.sleep(self.refill_interval)
+
+
+callback_dispatcher = CallbackDispatcher()
@@ -0,0 +1,94 @@
+import os
+from datetime import datetime
+from typing import Any, Optional
+
+from models.user import User
+from service.cache import TTLCache
+
+# Dashboards poll this; a few seconds of staleness saves an aggregation per poll.
+stats_cache = TTLCache(maxsize=64, ttl=float(os.getenv("STATS_CACHE_TTL", "10")))
+
+
+def _stats_pipeline(match: dict) -> list[dict]:
+    return [
+        {"$match": match},
+        {
+            "$facet": {
+                "totals": [
+                    {
+                        "$group": {
+                            "_id": None,
+                            "total": {"$sum": 1},
+                            "avg_quality_score": {"$avg": "$Quality_Score"},
+                            "avg_duration": {"$avg": "$Duration"},
+                            "total_duration": {"$sum": "$Duration"},
+                        }
+                    }
+                ],
+                "by_status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+                "by_outcome": [{"$group": {"_id": "$Outcome", "count": {"$sum": 1}}}],
+                "per_day": [
+                    {
+                        "$group": {
+                            "_id": {
+                                "$dateToString": {"format": "%Y-%m-%d", "date": "$createdAt"}
+                            },
+                            "count": {"$sum": 1},
+                        }
+                    },
+                    {"$sort": {"_id": 1}},
+                ],
+            }
+        },
+    ]
+
+
+async def get_call_stats(
+    created_from: Optional[datetime] = None, created_to: Optional[datetime] = None
+) -> dict[str, Any]:
+    """Aggregate call counts and averages with a single pipeline.
+
+    Results are cached for ``STATS_CACHE_TTL`` seconds per date range.
+
+    Args:
+        created_from (Optional[datetime]): Only count calls created at or after this.
+        created_to (Optional[datetime]): Only count calls created before this.
+
+    Returns:
+        dict[str, Any]: Totals, counts by status and outcome, and per-day volumes.
+    """
+    key = (created_from, created_to)
+    cached = stats_cache.get(key)
+    if cached is not None:
+        return cached
+
+    match: dict = {}
+    if created_from or created_to:
+        match["createdAt"] = {}
+        if created_from:
+            match["createdAt"]["$gte"] = created_from
+        if created_to:
+            match["createdAt"]["$lt"] = created_to
+
+    result = (await User.aggregate(_stats_pipeline(match)).to_list())[0]
+    totals = result["totals"][0] if result["totals"] else {}
+
+    by_outcome: dict[str, int] = {}
+    for row in result["by_outcome"]:
+        outcome = row["_id"] or "Unknown"
+        by_outcome[outcome] = by_outcome.get(outcome, 0) + row["count"]
+
+    stats = {
+        "total": totals.get("total", 0),
+        "avg_quality_score": totals.get("avg_quality_score"),
+        "avg_duration": totals.get("avg_duration"),
+        "total_duration": totals.get("total_duration", 0),
+        "by_status": {row["_id"]: row["count"] for row in result["by_status"]},
+        "by_outcome": by_outcome,
+        "per_day": [
+            {"date": row["_id"], "count": row["count"]} for row in result["per_day"]
+        ],
+        "generated_at": datetime.utcnow(),
+    }
+    stats_cache.set(key, stats)
+    return stats
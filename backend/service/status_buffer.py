@@ -0,0 +1,284 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Mapping, Optional
+
+from loguru import logger
+from pymongo import UpdateOne
+
+from models.call_event import CallEvent
+from models.user import User
+from service.call_events import record_events, webhook_event
+from service.call_feed import call_feed
+from service.call_status import StatusUpdate, apply_status_callback, parse_status_callback
+from service.user_cache import invalidate_user
+
+
+class StatusWriteBehind:
+    """Queues status callbacks and writes them in coalesced ``bulk_write`` batches.
+
+    The webhook only parses the form and enqueues it, so Twilio gets its
+    response without waiting on MongoDB. A background flusher drains the queue
+    every ``flush_interval_ms`` or as soon as ``batch_size`` events are
+    waiting, merges events for the same ``call_sid`` into one guarded update
+    and applies them with a single unordered ``bulk_write``. If the queue is
+    full the event is written inline instead of being dropped.
+
+    Every delivered callback, including stale and duplicate ones, is also
+    appended to the call event log in the same flush.
+
+    An update whose call record does not exist yet (the insert can trail the
+    first callbacks by a moment) is kept and retried on the following
+    flushes, up to ``max_attempts`` times. Events are only marked applied once
+    their write has landed.
+
+    Args:
+        flush_interval_ms (float): Maximum time an event waits before being
+            written; defaults to ``STATUS_FLUSH_INTERVAL_MS`` or 200.
+        batch_size (int): Events that trigger an early flush; defaults to
+            ``STATUS_FLUSH_BATCH_SIZE`` or 500.
+        max_queue (int): Queue capacity; defaults to ``STATUS_QUEUE_MAXSIZE``
+            or 10000.
+        max_attempts (int): Flushes an update for a missing call record is
+            tried before it is dropped; defaults to ``STATUS_MAX_ATTEMPTS`` or 25.
+    """
+
+    def __init__(
+        self,
+        flush_interval_ms: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+    ):
+        self.flush_interval = (
+            flush_interval_ms or float(os.getenv("STATUS_FLUSH_INTERVAL_MS", "200"))
+        ) / 1000
+        self.batch_size = batch_size or int(os.getenv("STATUS_FLUSH_BATCH_SIZE", "500"))
+        self.max_queue = max_queue or int(os.getenv("STATUS_QUEUE_MAXSIZE", "10000"))
+        self.max_attempts = max_attempts or int(os.getenv("STATUS_MAX_ATTEMPTS", "25"))
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._retry: dict[str, StatusUpdate] = {}
+        # call_sid -> flushes that found no call record for it
+        self._unmatched: dict[str, int] = {}
+        self._events: list[CallEvent] = []
+        # The flusher and an overflowing submit() both flush; both read and
+        # reset _retry, so only one may run at a time
+        self._flush_lock = asyncio.Lock()
+        self.enqueued = 0
+        self.skipped = 0
+        self.overflowed = 0
+        self.flushes = 0
+        self.written = 0
+        self.unmatched = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._task = asyncio.create_task(self._run())
+            logger.info("Status write-behind buffer started")
+
+    async def stop(self) -> None:
+        """Stop the flusher and write everything still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            await self.flush(self._drain())
+            logger.info(f"Status write-behind buffer stopped: {self.stats()}")
+
+    async def submit(self, form: Mapping[str, Any]) -> None:
+        """Queue a status callback, or apply it inline if the buffer is not running."""
+        event = webhook_event(form)
+        if self._queue is None or self._task is None:
+            await apply_status_callback(form)
+            await record_events([event] if event else [])
+            return
+        if event is not None:
+            self._events.append(event)
+
+        update = parse_status_callback(form)
+        if update is None:
+            return
+        if update.is_stale():
+            self.skipped += 1
+            return
+
+        try:
+            self._queue.put_nowait(update)
+            self.enqueued += 1
+        except asyncio.QueueFull:
+            self.overflowed += 1
+            await self.flush([update])
+
+    def _drain(self, limit: Optional[int] = None) -> list[StatusUpdate]:
+        updates = []
+        while self._queue is not None and not self._queue.empty():
+            if limit is not None and len(updates) >= limit:
+                break
+            updates.append(self._queue.get_nowait())
+        return updates
+
+    @staticmethod
+    def _merge(
+        merged: dict[str, StatusUpdate], updates: list[StatusUpdate]
+    ) -> dict[str, StatusUpdate]:
+        for update in updates:
+            current = merged.get(update.call_sid)
+            merged[update.call_sid] = update if current is None else current.merge(update)
+        return merged
+
+    async def flush(self, updates: list[StatusUpdate]) -> None:
+        """Merge updates per call and write them with one ``bulk_write``."""
+        async with self._flush_lock:
+            await self._flush(updates)
+
+    async def _flush(self, updates: list[StatusUpdate]) -> None:
+        events, self._events = self._events, []
+        await record_events(events)
+
+        merged = self._merge(dict(self._retry), updates)
+        if not merged:
+            return
+
+        started = time.perf_counter()
+        # MongoDB keeps milliseconds; stamp the batch so the re-read below can
+        # tell the documents it changed from the ones the guard left alone
+        now = datetime.utcnow()
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        try:
+            result = await User.get_pymongo_collection().bulk_write(
+                [UpdateOne(update.filter(), update.update(now)) for update in merged.values()],
+                ordered=False,
+            )
+            # All matched and none modified: every update was held back by
+            # the guard and there is nothing to read back
+            reread = result.modified_count or result.matched_count < len(merged)
+            stored = await self._stored_calls(merged) if reread else {}
+            self._retry = {}
+            for call_sid, update in merged.items():
+                doc = stored.get(call_sid)
+                if reread and doc is None:
+                    self._hold_unmatched(update)
+                    continue
+                self._unmatched.pop(call_sid, None)
+                if doc is None or doc.get("updatedAt") != now:
+                    # Stale, or would not have changed anything
+                    continue
+                update.mark_applied()
+                invalidate_user(call_sid)
+                # What was stored, e.g. SCHEDULED kept over a "completed" event
+                call_feed.publish(call_sid, **{key: doc.get(key) for key in update.fields})
+                self.written += 1
+        except Exception as e:
+            # Keep the batch for the next tick; the sequence guard makes
+            # re-applying any part that did land a no-op.
+            self.errors += 1
+            self._retry = merged
+            logger.error(f"Status flush of {len(merged)} calls failed: {e}")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.flushes += 1
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+        logger.debug(
+            f"Flushed {len(updates)} status events as {len(merged)} updates in {elapsed_ms:.1f}ms"
+        )
+
+    @staticmethod
+    async def _stored_calls(merged: dict[str, StatusUpdate]) -> dict[str, dict]:
+        """Read back the batch's calls, keyed by ``call_sid``.
+
+        A call missing from the result has no record yet. One whose
+        ``updatedAt`` is not the batch stamp was held back by the guard in
+        ``StatusUpdate.filter``: the event was stale or changed nothing, so it
+        needs no retry.
+        """
+        projection = {"call_sid": 1, "updatedAt": 1}
+        for update in merged.values():
+            projection.update(dict.fromkeys(update.fields, 1))
+        cursor = User.get_pymongo_collection().find(
+            {"call_sid": {"$in": list(merged)}}, projection
+        )
+        return {doc["call_sid"]: doc async for doc in cursor}
+
+    def _hold_unmatched(self, update: StatusUpdate) -> None:
+        attempts = self._unmatched.get(update.call_sid, 0) + 1
+        if attempts >= self.max_attempts:
+            self._unmatched.pop(update.call_sid, None)
+            self.dropped += 1
+            logger.error(
+                f"Dropping status {update.fields.get('status')} for {update.call_sid}: "
+                f"no call record after {attempts} attempts"
+            )
+            return
+        self._unmatched[update.call_sid] = attempts
+        self._retry[update.call_sid] = update
+        self.unmatched += 1
+        logger.warning(
+            f"No call record for {update.call_sid} yet; retrying status "
+            f"{update.fields.get('status')} (attempt {attempts}/{self.max_attempts})"
+        )
+
+    async def _run(self) -> None:
+        while True:
+            updates: list[StatusUpdate] = []
+            try:
+                if self._retry or self._events:
+                    # A failed batch, unmatched updates or logged-only events
+                    # are waiting; write them on the next tick even if no new
+                    # updates arrive.
+                    try:
+                        updates.append(
+                            await asyncio.wait_for(self._queue.get(), self.flush_interval)
+                        )
+                    except asyncio.TimeoutError:
+                        await self.flush([])
+                        continue
+                else:
+                    updates.append(await self._queue.get())
+                deadline = time.monotonic() + self.flush_interval
+                while len(updates) < self.batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        updates.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                updates.extend(self._drain(self.batch_size - len(updates)))
+                await self.flush(updates)
+            except asyncio.CancelledError:
+                # Shutdown while batching or mid-flush: hand the batch back to
+                # stop(), which writes it with whatever is still queued
+                self._retry = self._merge(self._retry, updates)
+                raise
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "pending_retry": len(self._retry),
+            "enqueued": self.enqueued,
+            "skipped": self.skipped,
+            "overflowed": self.overflowed,
+            "flushes": self.flushes,
+            "written": self.written,
+            "unmatched": self.unmatched,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "max_flush_ms": round(self.max_flush_ms, 2),
+            "avg_flush_ms": round(self._total_flush_ms / self.flushes, 2) if self.flushes else 0.0,
+        }
+
+
+status_buffer = StatusWriteBehind()
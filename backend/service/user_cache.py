@@ -0,0 +1,58 @@
+import os
+from typing import Optional, Union
+
+from beanie import PydanticObjectId
+
+from models.user import User
+from service.cache import TTLCache
+
+# Read-through cache of User documents, keyed both by ("id", _id) and by
+# ("call_sid", call_sid). Every write path must call invalidate_user.
+user_cache = TTLCache(
+    maxsize=int(os.getenv("USER_CACHE_SIZE", "2048")),
+    ttl=float(os.getenv("USER_CACHE_TTL", "30")),
+)
+
+
+def _store(user: User) -> None:
+    user_cache.set(("id", str(user.id)), user)
+    user_cache.set(("call_sid", user.call_sid), user)
+
+
+async def get_user_by_call_sid(call_sid: str) -> Optional[User]:
+    """Return the call's User, from the cache when possible.
+
+    A copy is returned so callers can modify and save it without touching the
+    cached instance.
+    """
+    user = user_cache.get(("call_sid", call_sid))
+    if user is None:
+        user = await User.find_one(User.call_sid == call_sid)
+        if user is None:
+            return None
+        _store(user)
+    return user.model_copy()
+
+
+async def get_user_by_id(user_id: Union[str, PydanticObjectId]) -> Optional[User]:
+    """Return a User by ``_id``, from the cache when possible (as a copy)."""
+    user = user_cache.get(("id", str(user_id)))
+    if user is None:
+        user = await User.get(PydanticObjectId(user_id))
+        if user is None:
+            return None
+        _store(user)
+    return user.model_copy()
+
+
+def invalidate_user(
+    call_sid: Optional[str] = None, user_id: Union[str, PydanticObjectId, None] = None
+) -> None:
+    """Drop a User from the cache under both of its keys."""
+    for key in (("call_sid", call_sid), ("id", str(user_id) if user_id else None)):
+        if key[1] is None:
+            continue
+        user = user_cache.pop(key)
+        if user is not None:
+            user_cache.invalidate(("id", str(user.id)))
+            user_cache.invalidate(("call_sid", user.call_sid))
@@ -0,0 +1,254 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Optional
+
+import numpy as np
+from loguru import logger
+from pipecat.audio.vad.silero import SileroOnnxModel, SileroVADAnalyzer
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams
+
+_shared_model: Optional[SileroOnnxModel] = None
+_load_lock = threading.Lock()
+
+
+def _model_path() -> str:
+    from importlib import resources
+
+    return str(resources.files("pipecat.audio.vad.data").joinpath("silero_vad.onnx"))
+
+
+def load_vad_model() -> SileroOnnxModel:
+    """Load the Silero ONNX session once per process and return it.
+
+    The ONNX ``InferenceSession`` is stateless and safe to run from several
+    threads; the recurrent state lives on each call's own model wrapper.
+    """
+    global _shared_model
+
+    with _load_lock:
+        if _shared_model is None:
+            started = time.perf_counter()
+            _shared_model = SileroOnnxModel(_model_path(), force_onnx_cpu=True)
+            logger.info(
+                f"Loaded shared Silero VAD model in {(time.perf_counter() - started) * 1000:.0f}ms"
+            )
+    return _shared_model
+
+
+def _call_model() -> SileroOnnxModel:
+    """A per-call model wrapper with its own state around the shared session."""
+    shared = load_vad_model()
+    model = SileroOnnxModel.__new__(SileroOnnxModel)
+    model.session = shared.session
+    model.sample_rates = shared.sample_rates
+    model.reset_states()
+    return model
+
+
+class SharedSileroVADAnalyzer(SileroVADAnalyzer):
+    """``SileroVADAnalyzer`` that reuses the process-wide ONNX session.
+
+    Only the per-call recurrent state, context window and VAD bookkeeping are
+    allocated for each call, instead of a full model load.
+    """
+
+    def __init__(self, *, sample_rate: Optional[int] = None, params: Optional[VADParams] = None):
+        VADAnalyzer.__init__(self, sample_rate=sample_rate, params=params)
+        self._model = _call_model()
+        self._last_reset_time = 0
+
+
+class _VADRequest:
+    __slots__ = ("x", "state", "sr", "future", "submitted")
+
+    def __init__(self, x: np.ndarray, state: np.ndarray, sr: int):
+        self.x = x
+        self.state = state
+        self.sr = sr
+        self.future: Future = Future()
+        self.submitted = time.perf_counter()
+
+
+class BatchedVADService:
+    """Runs Silero VAD for every active call in one batched ONNX run per tick.
+
+    Calls submit a frame (with its context prepended) and their recurrent
+    state; a dedicated thread waits for the first pending frame, gathers
+    whatever else arrives within ``tick_ms`` (up to ``max_batch``), stacks
+    them along the batch axis and runs the shared session once. Each caller's
+    future receives its confidence and updated state.
+
+    Args:
+        tick_ms (float): How long to gather frames after the first one;
+            defaults to ``VAD_BATCH_TICK_MS`` or 4.
+        max_batch (int): Largest batch per run; defaults to
+            ``VAD_MAX_BATCH`` or 128.
+    """
+
+    def __init__(self, tick_ms: Optional[float] = None, max_batch: Optional[int] = None):
+        self.tick = (
+            tick_ms if tick_ms is not None else float(os.getenv("VAD_BATCH_TICK_MS", "4"))
+        ) / 1000
+        self.max_batch = max_batch or int(os.getenv("VAD_MAX_BATCH", "128"))
+        self._requests: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.runs = 0
+        self.frames = 0
+        self._latency_ms: deque[float] = deque(maxlen=5000)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._session = load_vad_model().session
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="vad-batch", daemon=True)
+            self._thread.start()
+            logger.info("Batched VAD service started")
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._running = False
+            self._requests.put(None)
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def submit(self, x: np.ndarray, state: np.ndarray, sr: int) -> Future:
+        """Queue one call's frame; the future resolves to ``(confidence, state)``."""
+        if self._thread is None:
+            self.start()
+        request = _VADRequest(x, state, sr)
+        self._requests.put(request)
+        return request.future
+
+    def _gather(self) -> list[_VADRequest]:
+        first = self._requests.get()
+        if first is None:
+            return []
+        batch = [first]
+        deadline = time.perf_counter() + self.tick
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                request = self._requests.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if request is None:
+                break
+            batch.append(request)
+        return batch
+
+    def _infer(self, batch: list[_VADRequest]) -> None:
+        # The model takes one sample rate per run
+        by_rate: dict[int, list[_VADRequest]] = {}
+        for request in batch:
+            by_rate.setdefault(request.sr, []).append(request)
+
+        for sr, requests in by_rate.items():
+            try:
+                out, state = self._session.run(
+                    None,
+                    {
+                        "input": np.concatenate([r.x for r in requests], axis=0),
+                        "state": np.concatenate([r.state for r in requests], axis=1),
+                        "sr": np.array(sr, dtype="int64"),
+                    },
+                )
+            except Exception as e:
+                for request in requests:
+                    request.future.set_exception(e)
+                continue
+
+            done = time.perf_counter()
+            self.runs += 1
+            self.frames += len(requests)
+            for i, request in enumerate(requests):
+                self._latency_ms.append((done - request.submitted) * 1000)
+                request.future.set_result((out[i : i + 1], state[:, i : i + 1, :]))
+
+    def _run(self) -> None:
+        while self._running:
+            batch = self._gather()
+            if batch:
+                self._infer(batch)
+
+    def stats(self) -> dict[str, Any]:
+        latency = sorted(self._latency_ms)
+        return {
+            "runs": self.runs,
+            "frames": self.frames,
+            "avg_batch": round(self.frames / self.runs, 2) if self.runs else 0.0,
+            "latency_ms_p50": round(latency[len(latency) // 2], 3) if latency else None,
+            "latency_ms_p99": round(latency[int(len(latency) * 0.99)], 3) if latency else None,
+        }
+
+
+vad_service = BatchedVADService()
+
+
+class BatchedSileroModel(SileroOnnxModel):
+    """Per-call Silero state whose inference runs on ``vad_service``.
+
+    Keeps ``SileroOnnxModel``'s input validation, context window and state
+    handling; only the ONNX run is handed to the batching thread. It blocks
+    the caller, which is the analyzer's own executor thread, not the event
+    loop.
+    """
+
+    def __init__(self, service: BatchedVADService):
+        self.service = service
+        self.sample_rates = [8000, 16000]
+        self.reset_states()
+
+    def __call__(self, x, sr: int):
+        x, sr = self._validate_input(x, sr)
+        num_samples = 512 if sr == 16000 else 256
+        if np.shape(x)[-1] != num_samples:
+            raise ValueError(
+                f"Provided number of samples is {np.shape(x)[-1]} "
+                f"(Supported values: 256 for 8000 sample rate, 512 for 16000)"
+            )
+        context_size = 64 if sr == 16000 else 32
+
+        if self._last_sr and self._last_sr != sr:
+            self.reset_states()
+        if not np.shape(self._context)[1]:
+            self._context = np.zeros((1, context_size), dtype="float32")
+
+        x = np.concatenate((self._context, x), axis=1)
+        out, self._state = self.service.submit(x, self._state, sr).result()
+
+        self._context = x[..., -context_size:]
+        self._last_sr = sr
+        self._last_batch_size = 1
+        return out
+
+
+class BatchedSileroVADAnalyzer(SileroVADAnalyzer):
+    """``SileroVADAnalyzer`` whose inference is batched across calls."""
+
+    def __init__(self, *, sample_rate: Optional[int] = None, params: Optional[VADParams] = None):
+        VADAnalyzer.__init__(self, sample_rate=sample_rate, params=params)
+        self._model = BatchedSileroModel(vad_service)
+        self._last_reset_time = 0
+
+
+def build_vad_analyzer() -> VADAnalyzer:
+    """VAD analyzer for a new call, per ``VAD_MODE``.
+
+    ``shared`` (default) runs the shared session on each call's own thread,
+    ``batched`` batches inference across calls on one thread (less CPU per
+    call, a few ms more decision latency), and ``per_call`` loads a separate
+    model for every call.
+    """
+    mode = os.getenv("VAD_MODE", "shared").lower()
+    if mode == "per_call":
+        return SileroVADAnalyzer()
+    if mode == "batched":
+        return BatchedSileroVADAnalyzer()
+    return SharedSileroVADAnalyzer()
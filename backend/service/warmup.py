@@ -0,0 +1,103 @@
+import asyncio
+import importlib
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+
+def _import(module: str) -> Callable[[], Any]:
+    return lambda: importlib.import_module(module)
+
+
+def _load_vad() -> None:
+    from service.vad import load_vad_model, vad_service
+
+    load_vad_model()
+    if os.getenv("VAD_MODE", "shared").lower() == "batched":
+        vad_service.start()
+
+
+# Ordered so each step's timing is the cost it adds on top of the previous
+# ones. "bot" comes last and only pays for what the others did not load.
+WARMUP_STEPS: list[tuple[str, Callable[[], Any]]] = [
+    ("pipecat", _import("pipecat.pipeline.task")),
+    ("onnxruntime", _import("onnxruntime")),
+    ("silero", _import("pipecat.audio.vad.silero")),
+    ("silero_model", _load_vad),
+    ("deepgram", _import("pipecat.services.deepgram.stt")),
+    ("cartesia", _import("pipecat.services.cartesia.tts")),
+    ("groq", _import("pipecat.services.groq.llm")),
+    ("websocket_transport", _import("pipecat.transports.websocket.fastapi")),
+    ("litellm", _import("service.generate_context")),
+    ("cloudinary", _import("service.bot")),
+    ("prompt", _import("prompt_data")),
+    ("bot", _import("bot")),
+]
+
+
+class Warmup:
+    """Imports and initialises the bot stack in the background at startup.
+
+    Without it the first call after a deploy pays for importing pipecat and
+    the STT/TTS/LLM clients, loading the VAD model and running the
+    ``cloudinary.config`` side effects while the callee waits. Each step runs
+    in a worker thread so the server keeps answering health checks and
+    webhooks meanwhile. ``ready`` turns true only once every step has
+    succeeded; if one fails, ``failed_step`` names the first that did and the
+    process stays not ready.
+    """
+
+    def __init__(self, steps: list[tuple[str, Callable[[], Any]]] = WARMUP_STEPS):
+        self.steps = steps
+        self.ready = False
+        self.finished = False
+        self.failed_step: Optional[str] = None
+        self.timings_ms: dict[str, float] = {}
+        self.errors: dict[str, str] = {}
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        self.started_at = datetime.utcnow()
+        total = time.perf_counter()
+        for name, step in self.steps:
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(step)
+            except Exception as e:
+                # Keep going so one run reports every broken step
+                self.errors[name] = str(e)
+                self.failed_step = self.failed_step or name
+                logger.error(f"Warm-up step '{name}' failed: {e}")
+            self.timings_ms[name] = round((time.perf_counter() - started) * 1000, 1)
+        self.timings_ms["total"] = round((time.perf_counter() - total) * 1000, 1)
+        self.finished_at = datetime.utcnow()
+        self.finished = True
+        if self.errors:
+            logger.error(
+                f"Bot stack warm-up failed at '{self.failed_step}'; not ready: {self.errors}"
+            )
+            return
+        self.ready = True
+        logger.info(f"Bot stack warmed up in {self.timings_ms['total']:.0f}ms: {self.timings_ms}")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "failed_step": self.failed_step,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "timings_ms": self.timings_ms,
+            "errors": self.errors,
+        }
+
+
+warmup = Warmup()
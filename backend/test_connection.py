@@ -1,7 +1,7 @@
 import asyncio
 import os
 from dotenv import load_dotenv
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient
 
 load_dotenv(override=True)
 
@@ -14,10 +14,13 @@ async def test_connect():
         return
 
     try:
-        client = AsyncIOMotorClient(mongo_url, serverSelectionTimeoutMS=5000)
-        # Force a connection attempt
-        await client.admin.command("ping")
-        print(" Connected successfully!")
+        client = AsyncMongoClient(mongo_url, serverSelectionTimeoutMS=5000)
+        try:
+            # Force a connection attempt
+            await client.admin.command("ping")
+            print(" Connected successfully!")
+        finally:
+            await client.close()
     except Exception as e:
         print(f" Connection failed: {e}")
 
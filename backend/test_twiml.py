@@ -0,0 +1,58 @@
+"""The precompiled /twiml template must match the ``VoiceResponse`` builder byte for byte."""
+
+import os
+
+import pytest
+from twilio.twiml.voice_response import Connect, Stream, VoiceResponse
+
+from server_utils import TwimlRequest, TwimlTemplate, get_websocket_url
+
+SAMPLES = [
+    TwimlRequest(to_number="+919876543210", from_number="+14155550100"),
+    TwimlRequest(to_number="", from_number="+14155550100"),
+    TwimlRequest(to_number='+1 <555> & "co"', from_number="a'b\r\n\tc"),
+    TwimlRequest(to_number="नमस्ते", from_number="]]>&#10;"),
+]
+
+PARAMETERS = [
+    None,
+    {},
+    {"student_name": "Vicky Yadav"},
+    {"student_name": 'O\'Brien <"Jr"> & co\r\n\t', "note": "नमस्ते ]]>"},
+]
+
+ENVIRONMENTS = [
+    {"ENV": "local", "LOCAL_SERVER_URL": "https://example.ngrok.io"},
+    {"ENV": "production", "AGENT_NAME": "agent&co", "ORGANIZATION_NAME": "<org>"},
+]
+
+
+def voice_response_twiml(twiml_request, parameters=None):
+    """Build the /twiml document the original way, through ``VoiceResponse``."""
+    response = VoiceResponse()
+    connect = Connect()
+    stream = Stream(url=get_websocket_url())
+    stream.parameter(name="to_number", value=twiml_request.to_number)
+    stream.parameter(name="from_number", value=twiml_request.from_number)
+    if os.getenv("ENV") == "production":
+        service_host = f"{os.getenv('AGENT_NAME')}.{os.getenv('ORGANIZATION_NAME')}"
+        stream.parameter(name="_pipecatCloudServiceHost", value=service_host)
+    for name, value in (parameters or {}).items():
+        stream.parameter(name=name, value=value)
+    connect.append(stream)
+    response.append(connect)
+    response.pause(length=20)
+    return str(response)
+
+
+@pytest.mark.parametrize("env", ENVIRONMENTS, ids=["local", "production"])
+@pytest.mark.parametrize("parameters", PARAMETERS)
+@pytest.mark.parametrize("twiml_request", SAMPLES)
+def test_template_matches_voice_response(monkeypatch, env, parameters, twiml_request):
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    template = TwimlTemplate()
+
+    assert template.render(twiml_request, parameters) == voice_response_twiml(
+        twiml_request, parameters
+    )
@@ -10,6 +10,7 @@ interface CallData {
     name: string;
     email?: string;
     phonenumber?: string;
+    call_sid?: string;
     status: string;
     createdAt: string;
     Duration: number;
@@ -29,6 +30,8 @@ export default function HistoryPage() {
     const router = useRouter();
 
     const [history, setHistory] = useState<CallData[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [selectedCallId, setSelectedCallId] = useState<string | null>(null);
     const [searchQuery, setSearchQuery] = useState("");
 
@@ -45,7 +48,8 @@ export default function HistoryPage() {
                 const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/users/calls`);
                 if (response.ok) {
                     const data = await response.json();
-                    setHistory(data);
+                    setHistory(data.items);
+                    setNextCursor(data.next_cursor);
                     // Optionally select first call
                     // if (data.length > 0) setSelectedCallId(data[0]._id);
                 }
@@ -58,6 +62,40 @@ export default function HistoryPage() {
         fetchHistory();
     }, []);
 
+    // Live updates pushed by the server instead of re-polling the list
+    useEffect(() => {
+        const source = new EventSource(`${process.env.NEXT_PUBLIC_API_URL}/users/calls/stream`);
+        source.onmessage = (event) => {
+            const { type, ...delta } = JSON.parse(event.data);
+            const matches = (call: CallData) =>
+                (delta._id && call._id === delta._id) || (delta.call_sid && call.call_sid === delta.call_sid);
+            if (type === "insert") {
+                setHistory(prev => prev.some(matches) ? prev : [delta as CallData, ...prev]);
+                return;
+            }
+            setHistory(prev => prev.map(call => matches(call) ? { ...call, ...delta, _id: call._id } : call));
+            setSelectedCall(prev => prev && matches(prev) ? { ...prev, ...delta, _id: prev._id } : prev);
+        };
+        return () => source.close();
+    }, []);
+
+    const loadMore = async () => {
+        if (!nextCursor) return;
+        setLoadingMore(true);
+        try {
+            const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/users/calls?cursor=${encodeURIComponent(nextCursor)}`);
+            if (response.ok) {
+                const data = await response.json();
+                setHistory(prev => [...prev, ...data.items]);
+                setNextCursor(data.next_cursor);
+            }
+        } catch (err) {
+            console.error("Failed to fetch more history", err);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     // Fetch specific call details when selected
     useEffect(() => {
         const fetchCallDetails = async () => {
@@ -158,6 +196,15 @@ export default function HistoryPage() {
                             )
                         })
                     )}
+                    {!loadingHistory && nextCursor && (
+                        <button
+                            onClick={loadMore}
+                            disabled={loadingMore}
+                            className="w-full p-2 text-xs font-semibold text-indigo-300 rounded-xl border border-white/5 bg-white/[0.02] hover:bg-white/5 disabled:opacity-50"
+                        >
+                            {loadingMore ? "Loading..." : "Load more"}
+                        </button>
+                    )}
                 </div>
             </aside>
 
@@ -23,6 +23,16 @@ interface DailyStats {
     count: number;
 }
 
+interface CallStats {
+    total: number;
+    avg_quality_score: number | null;
+    avg_duration: number | null;
+    total_duration: number;
+    by_status: Record<string, number>;
+    by_outcome: Record<string, number>;
+    per_day: DailyStats[];
+}
+
 interface AggregatedMetrics {
     totalCalls: number;
     successRate: number;
@@ -32,52 +42,47 @@ interface AggregatedMetrics {
 
 export default function StatsPage() {
     const router = useRouter();
-    const [calls, setCalls] = useState<CallData[]>([]);
+    const [stats, setStats] = useState<CallStats | null>(null);
     const [todaysCalls, setTodaysCalls] = useState<CallData[]>([]);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
     const [searchQuery, setSearchQuery] = useState("");
 
-    // Derived metrics
+    // Metrics are aggregated on the server by /users/stats
     const metrics: AggregatedMetrics = useMemo(() => {
-        if (!calls.length) return { totalCalls: 0, successRate: 0, totalDuration: 0, activeToday: 0 };
+        if (!stats || !stats.total) return { totalCalls: 0, successRate: 0, totalDuration: 0, activeToday: 0 };
 
-        const totalCalls = calls.length;
-        const completedCalls = calls.filter(c => c.status === 'completed').length;
+        const totalCalls = stats.total;
+        const completedCalls = stats.by_status["completed"] || 0;
         const successRate = Math.round((completedCalls / totalCalls) * 100);
-        const totalDuration = calls.reduce((acc, curr) => acc + (curr.Duration || 0), 0);
+        const totalDuration = stats.total_duration || 0;
         const activeToday = todaysCalls.length;
 
         return { totalCalls, successRate, totalDuration, activeToday };
-    }, [calls, todaysCalls]);
+    }, [stats, todaysCalls]);
 
     // Daily stats for chart
-    const dailyStats: DailyStats[] = useMemo(() => {
-        const statsMap: Record<string, number> = {};
-        calls.forEach((call) => {
-            const dateStr = new Date(call.createdAt).toISOString().split("T")[0];
-            statsMap[dateStr] = (statsMap[dateStr] || 0) + 1;
-        });
-        return Object.entries(statsMap)
-            .map(([date, count]) => ({ date, count }))
-            .sort((a, b) => new Date(a.date).getTime() - new Date(b.date).getTime());
-    }, [calls]);
+    const dailyStats: DailyStats[] = useMemo(() => stats?.per_day ?? [], [stats]);
 
     useEffect(() => {
         const fetchCalls = async () => {
             try {
-                const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/users/calls`);
-                if (!response.ok) throw new Error(`Failed to fetch: ${response.statusText}`);
-                console.log("😉😉😉😉😉");
-                
-                console.log("response");
+                const statsResponse = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/users/stats`);
+                if (!statsResponse.ok) throw new Error(`Failed to fetch: ${statsResponse.statusText}`);
+                setStats(await statsResponse.json());
 
-                const data: CallData[] = await response.json();
-                setCalls(data);
-
-                // Filter today's calls initially
+                // Only today's calls are listed, so only fetch those
                 const today = new Date().toISOString().split("T")[0];
-                const todayList = data.filter(c => new Date(c.createdAt).toISOString().split("T")[0] === today);
+                const todayList: CallData[] = [];
+                let cursor: string | null = null;
+                do {
+                    const query: string = cursor ? `&cursor=${encodeURIComponent(cursor)}` : "";
+                    const response = await fetch(`${process.env.NEXT_PUBLIC_API_URL}/users/calls?limit=200&created_from=${today}T00:00:00${query}`);
+                    if (!response.ok) throw new Error(`Failed to fetch: ${response.statusText}`);
+                    const page = await response.json();
+                    todayList.push(...page.items);
+                    cursor = page.next_cursor;
+                } while (cursor);
                 setTodaysCalls(todayList);
 
             } catch (err: any) {
@@ -90,6 +95,22 @@ export default function StatsPage() {
         fetchCalls();
     }, []);
 
+    // Live updates pushed by the server instead of re-polling today's calls
+    useEffect(() => {
+        const source = new EventSource(`${process.env.NEXT_PUBLIC_API_URL}/users/calls/stream`);
+        source.onmessage = (event) => {
+            const { type, ...delta } = JSON.parse(event.data);
+            const matches = (call: CallData) =>
+                (delta._id && call._id === delta._id) || (delta.call_sid && call.call_sid === delta.call_sid);
+            if (type === "insert") {
+                setTodaysCalls(prev => prev.some(matches) ? prev : [delta as CallData, ...prev]);
+                return;
+            }
+            setTodaysCalls(prev => prev.map(call => matches(call) ? { ...call, ...delta, _id: call._id } : call));
+        };
+        return () => source.close();
+    }, []);
+
     // Filter logic
     const filteredCalls = useMemo(() => {
         if (!searchQuery) return todaysCalls;